@@ -5,9 +5,11 @@ from os import getenv
 from flask import Flask, jsonify, make_response
 from flask_cors import CORS
 from models import storage
+from api.v1.json_provider import FastJSONProvider
 from api.v1.views import app_views
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 # pretty-print JSON responses
 app.config["JSONIFY_PRETTYPRINT_REGULAR"] = True
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""This module serializes JSON with orjson or ujson when installed"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that uses orjson, else ujson, else the standard
+    library, with the output of Flask's default provider
+    """
+
+    def dumps(self, obj, **kwargs):
+        """serializes obj to a JSON string"""
+        indent = kwargs.get("indent")
+        sort_keys = kwargs.get("sort_keys", self.sort_keys)
+        try:
+            if orjson is not None and indent in (None, 2):
+                # leave dates and dataclasses to default(), which gives
+                # HTTP dates as Flask's provider does, not ISO 8601
+                option = (orjson.OPT_PASSTHROUGH_DATETIME |
+                          orjson.OPT_PASSTHROUGH_DATACLASS)
+                if indent:
+                    option |= orjson.OPT_INDENT_2
+                if sort_keys:
+                    option |= orjson.OPT_SORT_KEYS
+                return orjson.dumps(obj, default=self.default,
+                                    option=option).decode()
+            if ujson is not None:
+                return ujson.dumps(obj, default=self.default,
+                                   ensure_ascii=self.ensure_ascii,
+                                   sort_keys=sort_keys, indent=indent or 0)
+        except (TypeError, OverflowError):
+            # a value only the standard library knows how to serialize
+            pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """deserializes the JSON string or bytes s"""
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # let the standard library report the error
+                pass
+        return super().loads(s, **kwargs)
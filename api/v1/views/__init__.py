@@ -16,3 +16,9 @@ from api.v1.views.users import *
 from api.v1.views.places import *
 from api.v1.views.places_reviews import *
 from api.v1.views.places_amenities import *
+from api.v1.views.bulk import *
+from api.v1.views.caching import response_cache
+
+# serve the responses of cacheable views from memory
+app_views.before_request(response_cache.lookup)
+app_views.after_request(response_cache.store)
@@ -3,13 +3,22 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.streaming import stream
 from models import storage
 from models.amenity import Amenity
 
 
 @app_views.route("/amenities", methods=["GET"], strict_slashes=False)
+@etag(Amenity)
 def get_amenities():
     """Retrieves the list of all Amenity objects"""
+    page = paginate(storage.page, Amenity)
+    if page is None:
+        page = stream(storage.iterate, Amenity)
+    if page is not None:
+        return page
     amenities_dict = storage.all(Amenity)
     return jsonify([obj.to_dict() for obj in amenities_dict.values()])
 
@@ -17,6 +26,7 @@ def get_amenities():
 @app_views.route(
     "/amenities/<amenity_id>", methods=["GET"], strict_slashes=False
 )
+@etag(Amenity)
 def get_amenity(amenity_id):
     """Retrieves a single amenity object"""
     amenity = storage.get(Amenity, amenity_id)
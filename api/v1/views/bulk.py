@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""This module handles the bulk creation of objects of any resource"""
+
+from flask import abort, jsonify, make_response, request
+import json
+from api.v1.views import app_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# resource -> (class, required keys, {reference key: referenced class})
+resources = {
+    "states": (State, ["name"], {}),
+    "amenities": (Amenity, ["name"], {}),
+    "users": (User, ["email", "password"], {}),
+    "cities": (City, ["state_id", "name"], {"state_id": State}),
+    "places": (Place, ["city_id", "user_id", "name"],
+               {"city_id": City, "user_id": User}),
+    "reviews": (Review, ["place_id", "user_id", "text"],
+                {"place_id": Place, "user_id": User}),
+}
+
+
+def read_items():
+    """returns the objects posted as a JSON array or as NDJSON"""
+    if request.mimetype == "application/x-ndjson":
+        try:
+            return [json.loads(line) for line in request.stream
+                    if line.strip()]
+        except ValueError:
+            abort(400, "Not a JSON")
+    items = request.get_json(silent=True)
+    if items is None:
+        abort(400, "Not a JSON")
+    if type(items) is not list:
+        abort(400, "Not a JSON array")
+    return items
+
+
+@app_views.route(
+    "/<any({}):resource>/bulk".format(", ".join(resources)),
+    methods=["POST"], strict_slashes=False
+)
+def create_bulk(resource):
+    """Creates every object of a JSON array in a single save"""
+    cls, required, references = resources[resource]
+    items = read_items()
+
+    # validate every object before creating any
+    found = set()
+    for item in items:
+        if not item or type(item) is not dict:
+            abort(400, "Not a JSON")
+        for key in required:
+            if key not in item:
+                abort(400, "Missing {}".format(key))
+        for key, referenced in references.items():
+            # an id that is not a string references no object
+            if type(item[key]) is not str:
+                abort(404)
+            if (key, item[key]) not in found:
+                if storage.get(referenced, item[key]) is None:
+                    abort(404)
+                found.add((key, item[key]))
+
+    objs = [cls(**item) for item in items]
+    storage.bulk_save(objs)
+
+    # return the new objects with CREATED status code 201
+    return make_response(jsonify([obj.to_dict() for obj in objs]), 201)
@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""
+This module answers conditional GET requests from storage versions and
+caches the responses of the views that only depend on stored objects
+"""
+
+from collections import OrderedDict
+from flask import current_app, g, make_response, request
+from functools import wraps
+from hashlib import sha1
+from models import storage
+from os import getenv
+import threading
+import time
+
+
+def versions(classes):
+    """
+    Returns the storage versions of classes, read from storage once per
+    request, so that the response cache and the ETag share one query
+    """
+    names = [cls if type(cls) is str else cls.__name__ for cls in classes]
+    known = g.setdefault("versions", {})
+    missing = [name for name in names if name not in known]
+    if missing:
+        known.update(storage.versions(missing))
+    return [known[name] for name in names]
+
+
+def etag(*classes):
+    """
+    Decorates a GET view whose response only depends on the objects of
+    classes, so that it carries an ETag and a Last-Modified header, and
+    so that a request whose If-None-Match holds the current ETag gets a
+    304 before the view runs and serializes anything
+    """
+    def decorator(view):
+        """returns view answering conditional requests"""
+        @wraps(view)
+        def conditional_view(*args, **kwargs):
+            """calls view unless the client has its current response"""
+            current = versions(classes)
+            # the same URL also has other representations, e.g. NDJSON
+            variant = (request.full_path, str(request.accept_mimetypes),
+                       [tag for tag, modified in current])
+            tag = sha1(repr(variant).encode()).hexdigest()
+            modified = [modified for _, modified in current if modified]
+            matches = request.if_none_match
+            if not matches.star_tag and tag in matches:
+                response = current_app.response_class(status=304)
+            else:
+                # "*" only matches a resource that exists, which only
+                # the view can tell
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if matches.star_tag:
+                    response = current_app.response_class(status=304)
+            response.set_etag(tag)
+            if modified:
+                response.last_modified = max(modified)
+            return response
+        conditional_view.classes = classes
+        return conditional_view
+    return decorator
+
+
+def cached(*classes):
+    """
+    Marks a view whose response only depends on the objects of classes
+    and on the request, so that the response cache may keep it until
+    one of these objects changes
+    """
+    def decorator(view):
+        """returns view marked as cacheable"""
+        view.classes = classes
+        return view
+    return decorator
+
+
+class ResponseCache:
+    """
+    LRU cache of the responses of the views marked with the classes they
+    depend on, keyed by method, URL, Accept header and body. An entry is
+    only served while storage.version() of its classes is the one it was
+    built with, so changes made by other processes are seen too. It is
+    dropped as soon as storage reports a change to one of its classes,
+    after ttl seconds, or when the cache grows past max_bytes
+    """
+    # response headers replayed on a hit, CORS ones are added again
+    headers = ("Content-Type", "ETag", "Last-Modified", "X-Next-Cursor")
+
+    def __init__(self, max_bytes, ttl):
+        """Instantiate an empty ResponseCache"""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        # key -> (body, headers, class names, size, expiry, version tags),
+        # oldest first
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        # class name -> keys of the entries depending on its objects
+        self.__by_class = {}
+        self.__stats = {"hits": 0, "misses": 0, "stores": 0,
+                        "evictions": 0, "expirations": 0,
+                        "invalidations": 0}
+
+    def lookup(self):
+        """returns the cached response of the request, None on a miss"""
+        view = current_app.view_functions.get(request.endpoint)
+        names = [cls.__name__ for cls in getattr(view, "classes", ())]
+        if not names or self.max_bytes <= 0 or self.ttl <= 0:
+            return None
+        key = (request.method, request.path,
+               tuple(sorted(request.args.items(multi=True))),
+               str(request.accept_mimetypes),
+               sha1(request.get_data()).hexdigest())
+        tags = [tag for tag, modified in versions(names)]
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[4] <= time.monotonic():
+                self.__drop(key)
+                self.__stats["expirations"] += 1
+                entry = None
+            if entry is not None and entry[5] != tags:
+                # changed by a process that does not report to this one
+                self.__drop(key)
+                self.__stats["invalidations"] += 1
+                entry = None
+            if entry is None:
+                self.__stats["misses"] += 1
+                g.response_cache = (key, names, tags)
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats["hits"] += 1
+        response = current_app.response_class(entry[0], headers=entry[1])
+        return response.make_conditional(request)
+
+    def store(self, response):
+        """caches response if the request missed the cache"""
+        missed = g.pop("response_cache", None)
+        if missed is None or response.status_code != 200:
+            return response
+        if response.is_streamed:
+            return response
+        # versions from before the view ran: if an object changed since,
+        # the entry is dropped by the next lookup
+        key, names, tags = missed
+        body = response.get_data()
+        headers = [(name, value) for name, value in response.headers
+                   if name in self.headers]
+        size = len(body) + len(repr(key))
+        with self.__lock:
+            if size > self.max_bytes:
+                return response
+            self.__drop(key)
+            self.__entries[key] = (body, headers, names, size,
+                                   time.monotonic() + self.ttl, tags)
+            self.__bytes += size
+            for name in names:
+                self.__by_class.setdefault(name, set()).add(key)
+            self.__stats["stores"] += 1
+            while self.__bytes > self.max_bytes:
+                self.__drop(next(iter(self.__entries)))
+                self.__stats["evictions"] += 1
+        return response
+
+    def invalidate(self, name):
+        """drops the entries depending on the objects of class name"""
+        with self.__lock:
+            keys = self.__by_class.pop(name, ())
+            for key in keys:
+                self.__drop(key)
+            self.__stats["invalidations"] += len(keys)
+
+    def __drop(self, key):
+        """removes the entry of key, if any"""
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__bytes -= entry[3]
+            for name in entry[2]:
+                self.__by_class.get(name, set()).discard(key)
+
+    def stats(self):
+        """returns the cache counters, size and limits"""
+        with self.__lock:
+            stats = dict(self.__stats, entries=len(self.__entries),
+                         bytes=self.__bytes)
+        stats.update({"max_bytes": self.max_bytes, "ttl": self.ttl})
+        return stats
+
+
+# responses are kept for HBNB_API_CACHE_TTL seconds at most, 0 disables
+# the cache
+response_cache = ResponseCache(
+    int(getenv("HBNB_API_CACHE_MB", 32)) * 1024 * 1024,
+    float(getenv("HBNB_API_CACHE_TTL", 10)),
+)
+storage.watch(response_cache.invalidate)
@@ -3,6 +3,7 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
 from models import storage
 from models.state import State
 from models.city import City
@@ -11,6 +12,7 @@ from models.city import City
 @app_views.route(
     "/states/<state_id>/cities", methods=["GET"], strict_slashes=False
 )
+@etag(State, City)
 def get_cities(state_id):
     """Retrieves the list of all cities objects"""
     state = storage.get(State, state_id)
@@ -21,6 +23,7 @@ def get_cities(state_id):
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"], strict_slashes=False)
+@etag(City)
 def get_city(city_id):
     """Retrieves a single City object"""
     city = storage.get(City, city_id)
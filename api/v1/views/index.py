@@ -2,8 +2,11 @@
 """This module contains API endpoints for status and count features"""
 
 from api.v1.views import app_views
-from flask import jsonify
+from api.v1.views.caching import etag, response_cache
+from flask import abort, jsonify
+import models
 from models import storage
+from os import getenv
 
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -21,6 +24,7 @@ def status():
 
 
 @app_views.route("/stats", strict_slashes=False)
+@etag(Amenity, City, Place, Review, State, User)
 def count():
     """retrieves the number of each objects by type"""
     classes = {
@@ -31,6 +35,31 @@ def count():
         "states": State,
         "users": User,
     }
-    dictionary = {k: storage.count(v) for k, v in classes.items()}
+    counts = storage.counts(classes.values())
+    dictionary = {k: counts[v.__name__] for k, v in classes.items()}
 
     return jsonify(dictionary)
+
+
+def internal():
+    """answers 404 unless HBNB_API_INTERNAL_STATS=1, as the statistics
+    describe the deployment; the client address cannot tell, every
+    client of a reverse proxy on the same host comes from 127.0.0.1"""
+    if getenv("HBNB_API_INTERNAL_STATS") != "1":
+        abort(404)
+
+
+@app_views.route("/stats/pool", strict_slashes=False)
+def pool_stats():
+    """retrieves the database connection pool statistics, if enabled"""
+    internal()
+    if models.storage_t != "db":
+        abort(404)
+    return jsonify(storage.pool_stats())
+
+
+@app_views.route("/stats/cache", strict_slashes=False)
+def cache_stats():
+    """retrieves the response cache statistics, if enabled"""
+    internal()
+    return jsonify(response_cache.stats())
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""This module pages list responses with a limit and an opaque cursor"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from flask import abort, jsonify, request
+import json
+from models.base_model import time
+
+# the largest page a client can ask for
+MAX_LIMIT = 1000
+
+
+def encode_cursor(obj):
+    """returns the cursor of the page that starts right after obj"""
+    key = [obj.created_at.strftime(time), obj.id]
+    return urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """returns the (created_at, id) tuple a cursor points after"""
+    try:
+        created_at, id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.strptime(created_at, time), str(id)
+    except (TypeError, ValueError):
+        abort(400, "Invalid cursor")
+
+
+def paginate(fetch, *args, dump=lambda obj: obj.to_dict(), **kwargs):
+    """
+    Returns the response for the page the limit and cursor query
+    parameters ask for, or None when no limit is given
+    - fetch is called with *args, limit, after and **kwargs
+    - dump turns each fetched object into its JSON dictionary
+    The cursor of the next page, if any, is in the X-Next-Cursor header
+    """
+    limit = request.args.get("limit")
+    if limit is None:
+        return None
+    if not limit.isdigit() or not 0 < int(limit) <= MAX_LIMIT:
+        abort(400, "Invalid limit")
+    limit = int(limit)
+    cursor = request.args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+
+    # one extra object tells whether there is a next page
+    objs = fetch(*args, limit=limit + 1, after=after, **kwargs)
+    response = jsonify([dump(obj) for obj in objs[:limit]])
+    if len(objs) > limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(objs[limit - 1])
+    return response
@@ -3,27 +3,37 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import cached, etag
+from api.v1.views.pagination import paginate
+from api.v1.views.streaming import stream
 from models import storage
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
 from models.user import User
-from models.state import State
 
 
 @app_views.route(
     "/cities/<city_id>/places", methods=["GET"], strict_slashes=False
 )
+@etag(City, Place)
 def get_places(city_id):
     """Retrieves the list of all Place objects of a City"""
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
+    page = paginate(storage.page, Place, city_id=city.id)
+    if page is None:
+        page = stream(storage.iterate, Place, city_id=city.id)
+    if page is not None:
+        return page
+    # the whole collection is only loaded when it is not paged
     places = [place.to_dict() for place in city.places]
     return jsonify(places)
 
 
 @app_views.route("/places/<place_id>", methods=["GET"], strict_slashes=False)
+@etag(Place)
 def get_place(place_id):
     """Retrieves a single Place object by id"""
     place = storage.get(Place, place_id)
@@ -122,67 +132,42 @@ def update_place(place_id):
 
 
 @app_views.route("/places_search", methods=["POST"], strict_slashes=False)
+@cached(Amenity, City, Place)
 def advanced_search():
     """
     Retrieves all Place objects that meet the optional
     filter passed in the body of the request as JSON
     - states: list of State ids
     - cities: list of City ids
-    - amenities: list of Amenity ids
+    - amenities: list of Amenity ids, a Place must have all of them
     """
 
     # get posted data
     data = request.get_json()
-    states = data.get("states", None)
-    cities = data.get("cities", None)
-    amenities = data.get("amenities", None)
 
     # check posted data
     if data is None:
         abort(400, "Not a JSON")
 
-    # none of the filters is provided
-    if not data or all([not states, not cities, not amenities]):
-        all_places = [place.to_dict() for place in storage.all(Place).values()]
-        return jsonify(all_places)
-
-    # list holds result after applying filters
-    places_list = []
-
-    if states:
-        states_list = [storage.get(State, id) for id in states]
-        for state in states_list:
-            # check state it could be None!
-            if state:
-                for city in state.cities:
-                    for place in city.places:
-                        places_list.append(place)
-
-    if cities:
-        cities_list = [storage.get(City, id) for id in cities]
-        for city in cities_list:
-            # check city it could be None!
-            if city:
-                for place in city.places:
-                    # avoid duplicates
-                    if place not in places_list:
-                        places_list.append(place)
-
-    if amenities:
-        if not places_list:
-            places_list = storage.all(Place).values()
-        amenities_list = [storage.get(Amenity, id) for id in amenities]
-        temp_list = []
-        for place in places_list:
-            for amenity in amenities_list:
-                if amenity in place.amenities:
-                    temp_list.append(place)
-
-        places_list = temp_list
-
-    # prepare places list
-    places = [place.to_dict() for place in places_list]
-    # remove amenities key from each place dictionary
-    [place.pop("amenities", None) for place in places if "amenities" in place]
+    filters = (
+        data.get("states", None),
+        data.get("cities", None),
+        data.get("amenities", None),
+    )
+    page = paginate(storage.search_places, *filters, dump=search_result)
+    if page is None:
+        page = stream(storage.search_places, *filters, dump=search_result)
+    if page is not None:
+        return page
 
-    return jsonify(places)
+    places_list = storage.search_places(*filters)
+
+    return jsonify([search_result(place) for place in places_list])
+
+
+def search_result(place):
+    """Returns the dictionary of a place found by /places_search"""
+    place = place.to_dict()
+    # the amenities key holds objects that can not be serialized
+    place.pop("amenities", None)
+    return place
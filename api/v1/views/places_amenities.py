@@ -7,6 +7,7 @@ for Place-Amenity objects
 from os import environ
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
 from models import storage
 from models.amenity import Amenity
 from models.place import Place
@@ -15,10 +16,11 @@ from models.place import Place
 @app_views.route(
     "/places/<place_id>/amenities", methods=["GET"], strict_slashes=False
 )
+@etag(Place, Amenity)
 def get_place_amenities(place_id):
     """Retrieves the list of all Amenity objects of a Place"""
     # check if place exists
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["amenities"])
     if place is None:
         abort(404)
 
@@ -59,7 +61,10 @@ def delete_place_amenity(place_id, amenity_id):
         # check if amenity belongs to that place
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        # reassign rather than mutate so the storage sees the change
+        place.amenity_ids = [
+            id for id in place.amenity_ids if id != amenity_id
+        ]
 
     storage.save()
 
@@ -93,7 +98,8 @@ def post_place_amenity(place_id, amenity_id):
         if amenity_id in place.amenity_ids:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
-            place.amenity_ids.append(amenity_id)
+            # reassign rather than mutate so the storage sees the change
+            place.amenity_ids = place.amenity_ids + [amenity_id]
 
     storage.save()
     return make_response(jsonify(amenity.to_dict()), 201)
@@ -3,6 +3,9 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.streaming import stream
 from models import storage
 from models.review import Review
 from models.place import Place
@@ -12,17 +15,25 @@ from models.user import User
 @app_views.route(
     "/places/<place_id>/reviews", methods=["GET"], strict_slashes=False
 )
+@etag(Place, Review)
 def get_reviews(place_id):
     """Retrieves the list of all Review objects of a Place"""
     place = storage.get(Place, place_id)
     # check if place object exists
     if place is None:
         abort(404)
+    page = paginate(storage.page, Review, place_id=place.id)
+    if page is None:
+        page = stream(storage.iterate, Review, place_id=place.id)
+    if page is not None:
+        return page
+    # the whole collection is only loaded when it is not paged
     reviews = [obj.to_dict() for obj in place.reviews]
     return jsonify(reviews)
 
 
 @app_views.route("/reviews/<review_id>", methods=["GET"], strict_slashes=False)
+@etag(Review)
 def get_review(review_id):
     """Retrieves a Review object by id"""
     review = storage.get(Review, review_id)
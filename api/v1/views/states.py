@@ -3,13 +3,22 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.streaming import stream
 from models import storage
 from models.state import State
 
 
 @app_views.route("/states", methods=["GET"], strict_slashes=False)
+@etag(State)
 def get_states():
     """Retrieves the list of all State objects"""
+    page = paginate(storage.page, State)
+    if page is None:
+        page = stream(storage.iterate, State)
+    if page is not None:
+        return page
     states_dict = storage.all(State)
     return jsonify([obj.to_dict() for obj in states_dict.values()])
 
@@ -17,6 +26,7 @@ def get_states():
 @app_views.route(
     "/states/<string:state_id>", methods=["GET"], strict_slashes=False
 )
+@etag(State)
 def get_state(state_id):
     """Retrieves a single State object"""
     state = storage.get(State, state_id)
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""This module streams list responses one object at a time"""
+
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON = "application/x-ndjson"
+
+
+def stream(fetch, *args, dump=lambda obj: obj.to_dict(), **kwargs):
+    """
+    Returns a chunked response of the objects fetch(*args, **kwargs)
+    iterates over, or None when the client did not ask for streaming
+    - ?stream=1 streams a JSON array
+    - Accept: application/x-ndjson streams one JSON object per line
+    Only one object is serialized at a time, so memory does not grow
+    with the size of the collection
+    """
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON])
+    if best == NDJSON:
+        chunks = ndjson_chunks
+    elif request.args.get("stream") in ("1", "true"):
+        chunks = json_chunks
+        best = "application/json"
+    else:
+        return None
+    dumps = current_app.json.dumps
+    # keep the app context, and so the storage session, until the end
+    body = stream_with_context(
+        chunks(dumps(dump(obj)) for obj in fetch(*args, **kwargs))
+    )
+    return Response(body, mimetype=best)
+
+
+def json_chunks(items):
+    """yields items, serialized objects, as the chunks of a JSON array"""
+    yield "["
+    for i, item in enumerate(items):
+        yield "," + item if i else item
+    yield "]\n"
+
+
+def ndjson_chunks(items):
+    """yields items, serialized objects, as newline-delimited JSON"""
+    for item in items:
+        yield item + "\n"
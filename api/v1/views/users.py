@@ -3,18 +3,28 @@
 
 from flask import abort, jsonify, make_response, request
 from api.v1.views import app_views
+from api.v1.views.caching import etag
+from api.v1.views.pagination import paginate
+from api.v1.views.streaming import stream
 from models import storage
 from models.user import User
 
 
 @app_views.route("/users", methods=["GET"], strict_slashes=False)
+@etag(User)
 def get_users():
     """Retrieves the list of all User objects"""
+    page = paginate(storage.page, User)
+    if page is None:
+        page = stream(storage.iterate, User)
+    if page is not None:
+        return page
     users_dict = storage.all(User)
     return jsonify([obj.to_dict() for obj in users_dict.values()])
 
 
 @app_views.route("/users/<user_id>", methods=["GET"], strict_slashes=False)
+@etag(User)
 def get_user(user_id):
     """Retrieves a single User object by id"""
     user = storage.get(User, user_id)
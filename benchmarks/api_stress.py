@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Multi-threaded stress test of the API on the file storage engine
+
+usage: python3 -m benchmarks.api_stress [threads] [requests per thread]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from api.v1.app import app
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+args = [int(arg) for arg in sys.argv[1:]] + [16, 100][len(sys.argv[1:]):]
+n_threads, n_requests = args[:2]
+errors = []
+
+
+def worker(client):
+    """creates, reads, updates and deletes states and their cities"""
+    for i in range(n_requests // 5):
+        try:
+            response = client.post("/api/v1/states", json={"name": "s"})
+            assert response.status_code == 201, response.status_code
+            url = "/api/v1/states/" + response.get_json()["id"]
+            response = client.post(url + "/cities", json={"name": "c"})
+            assert response.status_code == 201, response.status_code
+            response = client.put(url, json={"name": "t"})
+            assert response.status_code == 200, response.status_code
+            response = client.get("/api/v1/states")
+            assert response.status_code == 200, response.status_code
+            response = client.delete(url)
+            assert response.status_code == 200, response.status_code
+        except Exception as e:
+            errors.append(e)
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(directory, "file.json")
+    storage.save()
+    client = app.test_client()
+    threads = [threading.Thread(target=worker, args=(client,))
+               for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = n_threads * (n_requests // 5) * 5
+    print("{} requests in {:.2f} s ({:.1f} req/s), {} errors".format(
+        total, elapsed, total / elapsed, len(errors)))
+    for error in errors[:5]:
+        print(repr(error))
+    storage.reload()
+    print("states left: {}".format(storage.count(State)))
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Load test of GET /api/v1/states from many threads against a SQLite
+stand-in database, for several connection pool sizes: throughput,
+latency, checkout timeouts and the pool's own wait statistics
+
+usage: python3 -m benchmarks.db_pool [threads] [requests per thread]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# pool size, max overflow and timeout of each run
+pools = [(1, 0, 0.5), (4, 0, 0.5), (4, 12, 0.5), (32, 0, 0.5)]
+
+
+def run(n_threads, n_requests):
+    """prints the figures of one pool configuration, run in its own
+    process as the pool is set up when the storage is created"""
+    from api.v1.app import app
+    from models import storage
+    from models.state import State
+
+    for i in range(100):
+        storage.new(State(name="state_{}".format(i)))
+    storage.save()
+    storage.close()
+    # timeouts are counted below rather than logged with their traceback
+    app.logger.disabled = True
+    client = app.test_client()
+    latencies, errors = [], []
+
+    def worker():
+        """sends n_requests GET requests"""
+        for i in range(n_requests):
+            start = time.perf_counter()
+            try:
+                response = client.get("/api/v1/states")
+                assert response.status_code == 200
+            except Exception as e:
+                errors.append(e)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    stats = storage.pool_stats()
+    print("{:>5}+{:<3} {:>8.0f} {:>8.1f} {:>8.1f} {:>7} {:>8.2f} {:>8.1f}"
+          .format(os.environ["HBNB_MYSQL_POOL_SIZE"],
+                  os.environ["HBNB_MYSQL_MAX_OVERFLOW"],
+                  len(latencies) / elapsed,
+                  latencies[len(latencies) // 2] * 1000,
+                  latencies[len(latencies) * 99 // 100] * 1000,
+                  len(errors), stats["wait_avg"] * 1000,
+                  stats["wait_max"] * 1000))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[2:] if sys.argv[1] == "child"]
+    if args:
+        run(*args)
+        sys.exit()
+    args = [int(arg) for arg in sys.argv[1:]] + [32, 50][len(sys.argv[1:]):]
+    print("{:>9} {:>8} {:>8} {:>8} {:>7} {:>8} {:>8}".format(
+        "pool", "req/s", "p50 ms", "p99 ms", "errors", "wait ms",
+        "max ms"))
+    for size, overflow, timeout in pools:
+        folder = tempfile.mkdtemp()
+        env = dict(os.environ, HBNB_TYPE_STORAGE="db",
+                   HBNB_DB_URL="sqlite:///" + os.path.join(folder, "hbnb.db"),
+                   HBNB_MYSQL_POOL_SIZE=str(size),
+                   HBNB_MYSQL_MAX_OVERFLOW=str(overflow),
+                   HBNB_MYSQL_POOL_TIMEOUT=str(timeout))
+        subprocess.run([sys.executable, "-m", "benchmarks.db_pool", "child"] +
+                       [str(arg) for arg in args[:2]], env=env, check=True)
+        os.remove(os.path.join(folder, "hbnb.db"))
+        os.rmdir(folder)
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Load test of concurrent POST /api/v1/states with group commit on and off
+
+usage: python3 -m benchmarks.group_commit [objects] [threads] [posts]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from api.v1.app import app
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+args = [int(arg) for arg in sys.argv[1:]] + [2000, 16, 400][len(sys.argv[1:]):]
+n_objects, n_threads, n_posts = args[:3]
+
+
+def run(window_ms):
+    """returns the POST throughput with the given group commit window"""
+    FileStorage._FileStorage__group_window = window_ms / 1000
+    client = app.test_client()
+
+    def worker(count):
+        """sends count POST requests"""
+        for i in range(count):
+            response = client.post("/api/v1/states", json={"name": "s"})
+            assert response.status_code == 201
+
+    threads = [threading.Thread(target=worker, args=(n_posts // n_threads,))
+               for _ in range(n_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return n_threads * (n_posts // n_threads) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(directory, "file.json")
+    for i in range(n_objects):
+        storage.new(State(name="state_{}".format(i)))
+    storage.save()
+    for window_ms in [0, 5]:
+        saves = storage.metrics()["saves"]
+        rate = run(window_ms)
+        print("window {} ms: {:8.1f} POST/s, {} flushes".format(
+            window_ms, rate, storage.metrics()["saves"] - saves))
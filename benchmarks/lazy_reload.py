@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Compares eager and lazy (HBNB_FILE_LAZY) FileStorage cold starts: reload
+time, resident memory, and the first get() and all(State) afterwards
+
+usage: python3 -m benchmarks.lazy_reload [size ...]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from models.engine.file_storage import FileStorage
+
+
+def populate(path, size):
+    """writes a snapshot and its index with size objects to path"""
+    from models import storage
+    from models.place import Place
+    from models.state import State
+
+    for name in ["objects", "by_class", "by_fk", "by_amenity", "ordered",
+                 "unsorted", "ordered_dicts", "unloaded", "dirty", "cache"]:
+        table = getattr(FileStorage, "_FileStorage__" + name)
+        setattr(FileStorage, "_FileStorage__" + name, type(table)())
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__journal = False
+    FileStorage._FileStorage__lazy = True
+    keys = []
+    for i in range(size):
+        if i % 10 == 0:
+            state = State(name="state_{}".format(i))
+            storage.new(state)
+        else:
+            place = Place(name="place_{}".format(i), city_id=state.id,
+                          user_id=state.id, number_rooms=i % 5)
+            storage.new(place)
+            keys.append(place.id)
+    storage.save()
+    return keys
+
+
+def cold_start(path, lazy, place_id):
+    """prints the cold start figures of one mode, run in a fresh process"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__lazy = lazy == "lazy"
+    from models.place import Place
+    from models.state import State
+
+    storage = FileStorage()
+    start = time.perf_counter()
+    storage.reload()
+    reloaded = time.perf_counter() - start
+    with open("/proc/self/statm", "r") as f:
+        rss = int(f.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    start = time.perf_counter()
+    assert storage.get(Place, place_id) is not None
+    got = time.perf_counter() - start
+    start = time.perf_counter()
+    states = len(storage.all(State))
+    listed = time.perf_counter() - start
+    print("{:>9} {:>9.2f} {:>9.0f} {:>9.3f} {:>9.3f}".format(
+        lazy, reloaded, rss, got * 1000, listed))
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["child"]:
+        cold_start(*sys.argv[2:])
+        sys.exit()
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "file.json")
+    print("{:>9} {:>9} {:>9} {:>9} {:>9} {:>9}".format(
+        "objects", "mode", "reload s", "RSS MB", "get ms", "all s"))
+    for size in sorted(sizes):
+        place_id = random.choice(populate(path, size))
+        for mode in ["eager", "lazy"]:
+            sys.stdout.write("{:>9} ".format(size))
+            sys.stdout.flush()
+            subprocess.run([sys.executable, "-m", "benchmarks.lazy_reload",
+                            "child", path, mode, place_id], check=True)
+        for name in os.listdir(folder):
+            os.remove(os.path.join(folder, name))
+    os.rmdir(folder)
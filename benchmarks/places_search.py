@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Measures POST /api/v1/places_search over a synthetic file storage dataset
+
+usage: python3 -m benchmarks.places_search [places]
+"""
+
+import sys
+import time
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+
+n_places = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+n_states = 100
+cities_per_state = 10
+rounds = 20
+
+if __name__ == "__main__":
+    # keep the benchmark away from the real file.json
+    FileStorage._FileStorage__file_path = "/nonexistent/file.json"
+    user = User(email="bench@hbnb.io", password="bench")
+    storage.new(user)
+    states, cities = [], []
+    for i in range(n_states):
+        state = State(name="state_{}".format(i))
+        storage.new(state)
+        states.append(state.id)
+        for j in range(cities_per_state):
+            city = City(name="city_{}_{}".format(i, j), state_id=state.id)
+            storage.new(city)
+            cities.append(city.id)
+    for i in range(n_places):
+        storage.new(Place(name="place_{}".format(i), user_id=user.id,
+                          city_id=cities[i % len(cities)]))
+
+    client = app.test_client()
+    for label, body in [("1 state", {"states": states[:1]}),
+                        ("10 states", {"states": states[:10]}),
+                        ("10 cities", {"cities": cities[:10]})]:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            response = client.post("/api/v1/places_search", json=body)
+        elapsed = (time.perf_counter() - start) / rounds
+        print("{:>10}: {:8.2f} ms/request, {} places".format(
+            label, elapsed * 1e3, len(response.get_json())))
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Compares places_search in SQL with the Python walk over relationships,
+on a seeded SQLite stand-in for the MySQL database
+
+usage: python3 -m benchmarks.places_search_db [places]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ["HBNB_TYPE_STORAGE"] = "db"
+os.environ.setdefault("HBNB_DB_URL", "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(), "hbnb.db"))
+
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+n_places = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+n_states = 50
+cities_per_state = 10
+rounds = 5
+
+
+def python_search(states, cities, amenities):
+    """the previous /places_search algorithm, run in Python"""
+    places_list = []
+    for state in [storage.get(State, id) for id in states]:
+        for city in state.cities:
+            for place in city.places:
+                places_list.append(place)
+    for city in [storage.get(City, id) for id in cities]:
+        for place in city.places:
+            if place not in places_list:
+                places_list.append(place)
+    amenities_list = [storage.get(Amenity, id) for id in amenities]
+    return [place for place in places_list
+            if all(amenity in place.amenities for amenity in amenities_list)]
+
+
+def timed(search, *args):
+    """returns the mean seconds per call and the number of places found"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        storage.close()
+        found = search(*args)
+    return (time.perf_counter() - start) / rounds, len(found)
+
+
+if __name__ == "__main__":
+    amenities = [Amenity(name="amenity_{}".format(i)) for i in range(10)]
+    user = User(email="bench@hbnb.io", password="bench")
+    for obj in amenities + [user]:
+        storage.new(obj)
+    states, cities = [], []
+    for i in range(n_states):
+        state = State(name="state_{}".format(i))
+        storage.new(state)
+        states.append(state.id)
+        for j in range(cities_per_state):
+            city = City(name="city_{}_{}".format(i, j), state_id=state.id)
+            storage.new(city)
+            cities.append(city.id)
+    storage.save()
+    for i in range(n_places):
+        place = Place(name="place_{}".format(i), user_id=user.id,
+                      city_id=cities[i % len(cities)])
+        place.amenities = amenities[:i % len(amenities)]
+        storage.new(place)
+    storage.save()
+
+    filters = (states[:5], cities[-20:], [a.id for a in amenities[:3]])
+    for label, search in [("sql", storage.search_places),
+                          ("python", python_search)]:
+        seconds, found = timed(search, *filters)
+        print("{:>6}: {:9.2f} ms/search, {} places".format(
+            label, seconds * 1e3, found))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Measures FileStorage.search_places over a large synthetic set of places
+
+usage: python3 -m benchmarks.places_search_index [places]
+"""
+
+import sys
+import timeit
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+n_places = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+n_states = 100
+cities_per_state = 100
+rounds = 100
+
+if __name__ == "__main__":
+    FileStorage._FileStorage__file_path = "/nonexistent/file.json"
+    amenities = [Amenity(name="amenity_{}".format(i)) for i in range(50)]
+    for amenity in amenities:
+        storage.new(amenity)
+    states, cities = [], []
+    for i in range(n_states):
+        state = State(name="state_{}".format(i))
+        storage.new(state)
+        states.append(state.id)
+        for j in range(cities_per_state):
+            city = City(name="city_{}_{}".format(i, j), state_id=state.id)
+            storage.new(city)
+            cities.append(city.id)
+    for i in range(n_places):
+        # amenity k is linked to every (k + 1)th place
+        linked = [a.id for k, a in enumerate(amenities) if i % (k + 1) == 0]
+        storage.new(Place(name="place_{}".format(i), amenity_ids=linked,
+                          city_id=cities[i % len(cities)]))
+
+    ids = [a.id for a in amenities]
+    for label, filters in [
+            ("1 city", {"cities": cities[:1]}),
+            ("1 state", {"states": states[:1]}),
+            ("2 rare amenities", {"amenities": ids[-2:]}),
+            ("1 state + 3 amenities", {"states": states[:1],
+                                       "amenities": ids[3:6]}),
+            ("5 cities + 1 amenity", {"cities": cities[:5],
+                                      "amenities": ids[1:2]})]:
+        seconds = timeit.timeit(lambda: storage.search_places(**filters),
+                                number=rounds) / rounds
+        print("{:>22}: {:8.3f} ms, {} places".format(
+            label, seconds * 1e3, len(storage.search_places(**filters))))
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Measures p50/p99 latency of GET /api/v1/states/<id> with a large file store
+
+usage: python3 -m benchmarks.request_latency [objects] [requests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from api.v1.app import app
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+args = [int(arg) for arg in sys.argv[1:]] + [50000, 200][len(sys.argv[1:]):]
+n_objects, n_requests = args[:2]
+
+
+def percentiles(client, url):
+    """returns the p50 and p99 latency in ms of n_requests GETs of url"""
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client.get(url)
+        latencies.append((time.perf_counter() - start) * 1e3)
+    latencies.sort()
+    p50, p99 = len(latencies) // 2, len(latencies) * 99 // 100
+    return latencies[p50], latencies[p99]
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(directory, "file.json")
+    for i in range(n_objects):
+        state = State(name="state_{}".format(i))
+        storage.new(state)
+    storage.save()
+    client = app.test_client()
+    url = "/api/v1/states/" + state.id
+    print("close() checks the file: p50 {:.2f} ms, p99 {:.2f} ms".format(
+        *percentiles(client, url)))
+    FileStorage.close = FileStorage.reload
+    print("close() reloads always:  p50 {:.2f} ms, p99 {:.2f} ms".format(
+        *percentiles(client, url)))
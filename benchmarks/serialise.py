@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Measures how many objects per second each model class serializes,
+with to_dict() alone and followed by the stdlib and the API JSON dumps
+
+usage: python3 -m benchmarks.serialise [objects]
+"""
+
+import json
+import sys
+import timeit
+from api.v1.app import app
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+samples = {
+    Amenity: {"name": "Wifi"},
+    City: {"name": "Austin", "state_id": "s"},
+    Place: {"name": "Loft", "city_id": "c", "user_id": "u",
+            "description": "A loft downtown", "number_rooms": 2,
+            "number_bathrooms": 1, "max_guest": 4, "price_by_night": 90,
+            "latitude": 30.26, "longitude": -97.74},
+    Review: {"text": "Great stay", "place_id": "p", "user_id": "u"},
+    State: {"name": "Texas"},
+    User: {"email": "a@b.c", "password": "pwd", "first_name": "Ada",
+           "last_name": "Lovelace"},
+}
+
+
+def rate(func, objs):
+    """returns how many objects per second func serializes"""
+    seconds = min(timeit.repeat(lambda: [func(obj) for obj in objs],
+                                number=1, repeat=5))
+    return len(objs) / seconds
+
+
+if __name__ == "__main__":
+    fast = app.json.dumps
+    print("{:>8} {:>12} {:>12} {:>12}".format(
+        "class", "to_dict/s", "+json/s", "+provider/s"))
+    for cls, attrs in samples.items():
+        objs = [cls(**attrs) for i in range(size)]
+        print("{:>8} {:>12,.0f} {:>12,.0f} {:>12,.0f}".format(
+            cls.__name__,
+            rate(lambda obj: obj.to_dict(), objs),
+            rate(lambda obj: json.dumps(obj.to_dict()), objs),
+            rate(lambda obj: fast(obj.to_dict()), objs)))
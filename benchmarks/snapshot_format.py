@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Compares the JSON and columnar FileStorage snapshot formats: save time,
+reload time and file size as the number of stored objects grows
+
+usage: python3 -m benchmarks.snapshot_format [size ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+tables = ["objects", "by_class", "by_fk", "by_amenity", "ordered",
+          "unsorted", "ordered_dicts", "dirty", "cache"]
+
+
+def clear():
+    """drops every object FileStorage holds in memory"""
+    for name in tables:
+        table = getattr(FileStorage, "_FileStorage__" + name)
+        setattr(FileStorage, "_FileStorage__" + name, type(table)())
+
+
+def populate(size):
+    """stores size objects, one state for every nine places"""
+    clear()
+    for i in range(size):
+        if i % 10 == 0:
+            state = State(name="state_{}".format(i))
+            storage.new(state)
+        else:
+            storage.new(Place(name="place_{}".format(i), city_id=state.id,
+                              user_id=state.id, number_rooms=i % 5,
+                              latitude=30.26, amenity_ids=[state.id]))
+
+
+if __name__ == "__main__":
+    folder = tempfile.mkdtemp()
+    FileStorage._FileStorage__journal = False
+    print("{:>9} {:>9} {:>9} {:>9} {:>9}".format(
+        "objects", "format", "save s", "reload s", "MB"))
+    for size in sorted(sizes):
+        populate(size)
+        for fmt in ["json", "columnar"]:
+            path = os.path.join(folder, "file." + fmt)
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__format = fmt
+            FileStorage._FileStorage__cache = {}
+            start = time.perf_counter()
+            storage.save()
+            saved = time.perf_counter() - start
+            objects = FileStorage._FileStorage__objects
+            clear()
+            start = time.perf_counter()
+            storage.reload()
+            loaded = time.perf_counter() - start
+            assert len(FileStorage._FileStorage__objects) == len(objects)
+            print("{:>9} {:>9} {:>9.2f} {:>9.2f} {:>9.1f}".format(
+                size, fmt, saved, loaded, os.path.getsize(path) / 1e6))
+            os.remove(path)
+    os.rmdir(folder)
@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+"""
+Measures storage.get() latency as the number of stored objects grows
+
+usage: python3 -m benchmarks.storage_get [size ...]
+"""
+
+import sys
+import timeit
+from models import storage
+from models.state import State
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000, 1000000]
+lookups = 10000
+
+if __name__ == "__main__":
+    count = 0
+    for size in sorted(sizes):
+        while count < size:
+            state = State(name="state_{}".format(count))
+            storage.new(state)
+            count += 1
+        target = state.id
+        seconds = timeit.timeit(lambda: storage.get(State, target),
+                                number=lookups)
+        print("{:>9} objects: {:8.3f} us/get".format(
+            size, seconds / lookups * 1e6))
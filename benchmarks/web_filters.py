@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Measures requests/sec of GET /hbnb_filters with a large file store, when
+every request renders the page because an amenity changed before it, and
+when the page is served from the cache
+
+usage: python3 -m benchmarks.web_filters [states] [cities per state]
+                                         [requests]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def rate(client, n_requests, before=None):
+    """returns the requests/sec of n_requests GETs of /hbnb_filters"""
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        if before:
+            before()
+        assert client.get("/hbnb_filters").status_code == 200
+    return n_requests / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    args += [1000, 100, 50][len(args):]
+    n_states, n_cities, n_requests = args[:3]
+    directory = tempfile.mkdtemp()
+    FileStorage._FileStorage__file_path = os.path.join(directory, "file.json")
+    objs = []
+    for i in range(n_states):
+        state = State(name="state_{}".format(i))
+        objs.append(state)
+        objs.extend(City(name="city_{}".format(j), state_id=state.id)
+                    for j in range(n_cities))
+    amenity = Amenity(name="Wifi")
+    storage.bulk_save(objs + [amenity])
+    page = importlib.import_module("web_flask.10-hbnb_filters")
+    client = page.app.test_client()
+
+    def touch():
+        """changes an amenity so that the next page is rendered again"""
+        amenity.name = amenity.name
+
+    print("{} states x {} cities".format(n_states, n_cities))
+    print("rendered: {:8.1f} req/s".format(rate(client, n_requests, touch)))
+    print("cached:   {:8.1f} req/s".format(rate(client, n_requests * 20)))
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
@@ -3,6 +3,7 @@
 
 import cmd
 from datetime import datetime
+import json
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -69,6 +70,42 @@ class HBNBCommand(cmd.Cmd):
         print(instance.id)
         instance.save()
 
+    def do_import(self, arg):
+        """Creates the instances of a class listed in a JSON array or
+        NDJSON file, with a single save"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** class name missing **")
+            return False
+        if args[0] not in classes:
+            print("** class doesn't exist **")
+            return False
+        if len(args) == 1:
+            print("** file name missing **")
+            return False
+        try:
+            with open(args[1], "r") as f:
+                text = f.read()
+        except OSError:
+            print("** file doesn't exist **")
+            return False
+        try:
+            if text.lstrip().startswith("["):
+                items = json.loads(text)
+            else:
+                items = [json.loads(line) for line in text.splitlines()
+                         if line.strip()]
+        except ValueError:
+            print("** invalid JSON **")
+            return False
+        if type(items) is not list or \
+                any(type(item) is not dict for item in items):
+            print("** invalid JSON **")
+            return False
+        objs = [classes[args[0]](**item) for item in items]
+        models.storage.bulk_save(objs)
+        print(len(objs))
+
     def do_show(self, arg):
         """Prints an instance as a string based on the class and id"""
         args = shlex.split(arg)
@@ -77,9 +114,10 @@ class HBNBCommand(cmd.Cmd):
             return False
         if args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    print(models.storage.all()[key])
+                obj = models.storage.query(classes[args[0]]).filter(
+                    id=args[1]).first()
+                if obj is not None:
+                    print(obj)
                 else:
                     print("** no instance found **")
             else:
@@ -94,9 +132,10 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    models.storage.all().pop(key)
+                obj = models.storage.query(classes[args[0]]).filter(
+                    id=args[1]).first()
+                if obj is not None:
+                    models.storage.delete(obj)
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -132,8 +171,9 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                k = args[0] + "." + args[1]
-                if k in models.storage.all():
+                obj = models.storage.query(classes[args[0]]).filter(
+                    id=args[1]).first()
+                if obj is not None:
                     if len(args) > 2:
                         if len(args) > 3:
                             if args[0] == "Place":
@@ -147,8 +187,8 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
-                            setattr(models.storage.all()[k], args[2], args[3])
-                            models.storage.all()[k].save()
+                            setattr(obj, args[2], args[3])
+                            obj.save()
                         else:
                             print("** value missing **")
                     else:
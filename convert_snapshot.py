@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+"""
+Converts a FileStorage snapshot between the JSON and columnar formats,
+loading models/engine/snapshot.py alone so that the models package, and
+the file.json of the current directory with it, is never loaded
+
+usage: ./convert_snapshot.py json|columnar <source> <target>
+"""
+
+import importlib.util
+import os
+import sys
+
+
+def load_snapshot():
+    """returns the snapshot module, loaded from its file"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "models", "engine", "snapshot.py")
+    spec = importlib.util.spec_from_file_location("snapshot", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("json", "columnar"):
+        sys.exit(__doc__.strip().splitlines()[-1])
+    load_snapshot().convert(*sys.argv[1:])
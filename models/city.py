@@ -16,7 +16,7 @@ class City(BaseModel, Base):
     if models.storage_t == "db":
         __tablename__ = "cities"
         state_id = Column(String(60), ForeignKey("states.id"), nullable=False)
-        name = Column(String(128), nullable=False)
+        name = Column(String(128), nullable=False, index=True)
         places = relationship("Place", backref="cities")
     else:
         state_id = ""
@@ -31,9 +31,4 @@ class City(BaseModel, Base):
         @property
         def places(self):
             """getter for list of places instances related to the city"""
-            place_list = []
-            all_places = models.storage.all(Place)
-            for place in all_places.values():
-                if place.city_id == self.id:
-                    place_list.append(place)
-            return place_list
+            return models.storage.query(Place).filter(city_id=self.id).all()
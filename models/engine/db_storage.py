@@ -3,18 +3,28 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.pool import TimedQueuePool
+from models.engine.query import Query, compare
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import operator
 from os import getenv
+from itertools import chain
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import (Column, DateTime, Integer, String, Table, and_,
+                        create_engine, event, func, insert, or_, select,
+                        update)
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import (joinedload, scoped_session, selectinload,
+                            sessionmaker)
 
 classes = {
     "Amenity": Amenity,
@@ -25,12 +35,23 @@ classes = {
     "User": User,
 }
 
+if models.storage_t == "db":
+    # one row per class, bumped in every transaction changing its rows or
+    # its links, so that version() is a primary key lookup whatever the
+    # size of the table, and sees the commits of every process
+    versions = Table("versions", Base.metadata,
+                     Column("name", String(60), primary_key=True),
+                     Column("changes", Integer, nullable=False, default=0),
+                     Column("updated_at", DateTime))
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
 
     __engine = None
     __session = None
+    # number of rows iterate() fetches from the database at a time
+    __batch_size = 1000
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -39,33 +60,99 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv("HBNB_MYSQL_HOST")
         HBNB_MYSQL_DB = getenv("HBNB_MYSQL_DB")
         HBNB_ENV = getenv("HBNB_ENV")
-        self.__engine = create_engine(
-            "mysql+mysqldb://{}:{}@{}/{}".format(
+        # a full URL, e.g. sqlite:///hbnb.db for a local stand-in database
+        HBNB_DB_URL = getenv("HBNB_DB_URL")
+        url = make_url(
+            HBNB_DB_URL or "mysql+mysqldb://{}:{}@{}/{}".format(
                 HBNB_MYSQL_USER, HBNB_MYSQL_PWD, HBNB_MYSQL_HOST, HBNB_MYSQL_DB
             )
         )
+        # check connections before use and drop them before MySQL's
+        # wait_timeout does, so the threaded API never gets a stale one
+        pool_args = {
+            "pool_pre_ping": getenv("HBNB_MYSQL_POOL_PRE_PING", "1") == "1",
+            "pool_recycle": int(getenv("HBNB_MYSQL_POOL_RECYCLE", 3600)),
+        }
+        if url.get_backend_name() != "sqlite" or url.database not in (
+                None, "", ":memory:"):
+            # an in-memory SQLite database lives in a single connection
+            pool_args.update({
+                "poolclass": TimedQueuePool,
+                "pool_size": int(getenv("HBNB_MYSQL_POOL_SIZE", 10)),
+                "max_overflow": int(getenv("HBNB_MYSQL_MAX_OVERFLOW", 20)),
+                "pool_timeout": float(getenv("HBNB_MYSQL_POOL_TIMEOUT", 30)),
+            })
+        self.__engine = create_engine(url, **pool_args)
+        # callables called with the name of every class a commit changed
+        self.__watchers = []
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=None, order_by=None):
+        """query on the current database session, eagerly loading the
+        relationships named in load, e.g. ["cities", "places.reviews"],
+        and sorting the rows of each class by the column order_by"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load:
+                    query = query.options(*self.__loaders(classes[clss], load))
+                column = getattr(classes[clss], order_by or "", None)
+                if column is not None:
+                    query = query.order_by(column, classes[clss].id)
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + "." + obj.id
                     new_dict[key] = obj
         return new_dict
 
+    def __loaders(self, cls, load):
+        """returns the loader options of the relationship paths in load"""
+        options = []
+        for path in load:
+            option, owner = None, cls
+            for name in path.split("."):
+                attr = getattr(owner, name)
+                # one extra SELECT ... IN per collection, a JOIN otherwise
+                loader = selectinload if attr.property.uselist else joinedload
+                if option is None:
+                    option = loader(attr)
+                else:
+                    option = getattr(option, loader.__name__)(attr)
+                owner = attr.property.mapper.class_
+            options.append(option)
+        return options
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """insert objs with one multi-row INSERT per class, bypassing the
+        unit of work"""
+        groups = {}
+        for obj in objs:
+            groups.setdefault(type(obj), []).append(obj)
+        names = {cls.__name__ for cls in groups}
+        self.__session.info.setdefault("touched", set()).update(names)
+        self.__bump(self.__session.connection(), names)
+        for cls, group in groups.items():
+            columns = [column.key for column in cls.__mapper__.column_attrs]
+            self.__session.execute(insert(cls), [
+                {column: getattr(obj, column) for column in columns}
+                for obj in group
+            ])
+
     def save(self):
         """commit all changes of the current database session"""
         self.__session.commit()
 
+    def bulk_save(self, objs):
+        """insert objs and commit them in a single transaction"""
+        self.bulk_new(objs)
+        self.save()
+
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
@@ -74,7 +161,20 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        with self.__engine.connect() as connection:
+            known = set(connection.scalars(select(versions.c.name)))
+        for name in classes:
+            if name not in known:
+                try:
+                    with self.__engine.begin() as connection:
+                        connection.execute(insert(versions).values(
+                            name=name, changes=0))
+                except IntegrityError:
+                    pass  # another process inserted it first
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__touch)
+        event.listen(sess_factory, "after_commit", self.__notify)
+        event.listen(sess_factory, "after_rollback", self.__forget)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
@@ -82,20 +182,183 @@ class DBStorage:
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """retrieve one object"""
+    def watch(self, callback):
+        """calls callback with the class name of every row added, updated
+        or deleted by a commit of this process from now on"""
+        self.__watchers.append(callback)
+
+    def __touch(self, session, flush_context):
+        """records the classes of the objects a flush wrote, and of the
+        objects linked to or unlinked from them, and bumps their versions"""
+        names = set()
+        for obj in chain(session.new, session.dirty, session.deleted):
+            names.add(type(obj).__name__)
+            state = sqlalchemy.inspect(obj)
+            for relation in state.mapper.relationships:
+                # rows of an association table, e.g. place_amenity
+                if relation.secondary is not None and (
+                        obj in session.deleted or
+                        state.attrs[relation.key].history.has_changes()):
+                    names.add(relation.mapper.class_.__name__)
+        session.info.setdefault("touched", set()).update(names)
+        self.__bump(session.connection(), names)
+
+    def __bump(self, connection, names):
+        """counts a change to the rows of the classes called names"""
+        if names:
+            connection.execute(
+                update(versions).where(versions.c.name.in_(names))
+                .values(changes=versions.c.changes + 1,
+                        updated_at=datetime.utcnow()))
+
+    def __notify(self, session):
+        """tells the watchers which classes the transaction changed"""
+        for name in session.info.pop("touched", ()):
+            for callback in self.__watchers:
+                callback(name)
+
+    def __forget(self, session):
+        """drops the classes of a rolled back transaction"""
+        session.info.pop("touched", None)
+
+    def version(self, cls):
+        """returns a tag that changes whenever a cls row is added, updated
+        or deleted, or linked to another one, and the time of the last
+        such change"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        return self.versions([cls])[cls]
+
+    def versions(self, clss):
+        """returns the version() of each class of clss by name, read in
+        a single query"""
+        names = [cls if type(cls) is str else cls.__name__ for cls in clss]
+        rows = self.__session.execute(
+            select(versions.c.name, versions.c.changes,
+                   versions.c.updated_at).where(versions.c.name.in_(names)))
+        found = {name: (changes, modified)
+                 for name, changes, modified in rows}
+        tags = {}
+        for name in names:
+            changes, modified = found.get(name, (0, None))
+            tags[name] = ("{}-{}".format(
+                changes, modified.isoformat() if modified else ""), modified)
+        return tags
+
+    def pool_stats(self):
+        """returns the statistics of the database connection pool"""
+        pool = self.__engine.pool
+        stats = {"class": type(pool).__name__, "status": pool.status()}
+        if isinstance(pool, TimedQueuePool):
+            stats.update(pool.stats())
+        return stats
+
+    def get(self, cls, id, load=None):
+        """retrieve one object, eagerly loading the relationships in load"""
         if cls in classes.values() and id and type(id) == str:
-            all_objects = self.all(cls)
-            for obj in all_objects.values():
-                if obj.id == id:
-                    return obj
+            options = self.__loaders(cls, load) if load else []
+            return self.__session.get(cls, id, options=options)
         return None
 
     def count(self, cls=None):
         """count the number of objects in storage"""
-        objects = {}
         if cls in classes.values():
-            objects = self.all(cls)
-        else:
-            objects = self.all()
-        return len(objects)
+            return self.counts([cls])[cls.__name__]
+        return sum(self.counts().values())
+
+    def counts(self, clss=None):
+        """count the objects of each class in a single query"""
+        if clss is None:
+            clss = classes.values()
+        query = select(*[
+            select(func.count()).select_from(c).scalar_subquery()
+            .label(c.__name__) for c in clss
+        ])
+        return dict(self.__session.execute(query).one()._mapping)
+
+    def query(self, cls):
+        """returns a Query on the cls rows, run as SQL"""
+        if type(cls) is str:
+            cls = classes.get(cls, cls)
+        return Query(cls, self.__run)
+
+    def __run(self, query, count):
+        """returns the rows matching query, or their number if count"""
+        cls = query.cls
+        if cls not in classes.values():
+            # no table, e.g. BaseModel: no rows, as get() finds none
+            return 0 if count else []
+        sql = self.__session.query(cls)
+        columns = cls.__mapper__.column_attrs.keys()
+        for attr, op, operand in query.filters:
+            if attr not in columns:
+                # as in FileStorage, an attribute no row has is None
+                if not compare(None, op, operand):
+                    return 0 if count else []
+                continue
+            column = getattr(cls, attr)
+            if op == "in":
+                sql = sql.filter(column.in_(operand))
+            else:
+                op = {"lte": "le", "gte": "ge"}.get(op, op)
+                sql = sql.filter(getattr(operator, op)(column, operand))
+        if count:
+            return sql.count()
+        if query.ordering or query.size is not None:
+            sql = sql.order_by(*[
+                getattr(cls, attr).desc() if descending
+                else getattr(cls, attr)
+                for attr, descending in query.ordering if attr in columns
+            ], cls.id)
+        if query.size is not None:
+            sql = sql.limit(query.size)
+        return sql.all()
+
+    def page(self, cls, limit, after=None, **filters):
+        """returns up to limit cls objects matching filters, ordered by
+        (created_at, id) and starting after the cursor tuple after"""
+        if type(cls) is str:
+            cls = classes[cls]
+        query = self.__session.query(cls).filter_by(**filters)
+        return self.__keyset(query, cls, limit, after).all()
+
+    def iterate(self, cls, **filters):
+        """yields the cls objects matching filters, fetched in batches"""
+        if type(cls) is str:
+            cls = classes[cls]
+        query = self.__session.query(cls).filter_by(**filters)
+        return iter(query.yield_per(self.__batch_size))
+
+    def __keyset(self, query, cls, limit, after):
+        """restricts query to a (created_at, id) keyset page of cls"""
+        if after:
+            created_at, id = after
+            query = query.filter(or_(
+                cls.created_at > created_at,
+                and_(cls.created_at == created_at, cls.id > id)
+            ))
+        return query.order_by(cls.created_at, cls.id).limit(limit)
+
+    def search_places(self, states=None, cities=None, amenities=None,
+                      limit=None, after=None):
+        """returns the places in any of states or cities with all amenities,
+        a keyset page of them if limit is given"""
+        query = self.__session.query(Place)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(states or []),
+                    City.id.in_(cities or []))
+            )
+        if amenities:
+            wanted = set(amenities)
+            place_amenity = Base.metadata.tables["place_amenity"]
+            having_all = (
+                select(place_amenity.c.place_id)
+                .where(place_amenity.c.amenity_id.in_(wanted))
+                .group_by(place_amenity.c.place_id)
+                .having(func.count() == len(wanted))
+            )
+            query = query.filter(Place.id.in_(having_all))
+        if limit is not None:
+            query = self.__keyset(query, Place, limit, after)
+        return query.all()
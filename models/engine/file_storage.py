@@ -3,10 +3,21 @@
 Contains the FileStorage class
 """
 
+import bisect
+from contextlib import contextmanager
+from datetime import datetime
 import json
+import mmap
+import os
+import tempfile
+import threading
+import time
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import snapshot
+from models.engine.query import Query
+from models.engine.rwlock import RWLock
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -30,66 +41,860 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __by_class = {}
+    # foreign keys that get a secondary index
+    __fk_attrs = ("state_id", "city_id", "place_id", "user_id")
+    # dictionary - (<class name>, foreign key) -> {value: {key: obj}}
+    __by_fk = {}
+    # dictionary - amenity id -> {key: place} of the places linked to it
+    __by_amenity = {}
+    # attributes that objects having them are kept sorted by, ties
+    # broken by id
+    __order_attrs = ("created_at", "name")
+    # dictionary - (<class name>, attribute) -> sorted [(value, id)]
+    __ordered = {}
+    # set - (<class name>, attribute) of __ordered lists that need a sort
+    __unsorted = set()
+    # dictionary - (<class name>, attribute) -> {key: obj} in the order of
+    # __ordered, built by all() and dropped when the list changes
+    __ordered_dicts = {}
+    # integer - permissions of a new JSON file, those open() would give;
+    # the umask can only be read by setting it, so it is put back
+    __mode = os.umask(0)
+    os.umask(__mode)
+    __mode = 0o666 & ~__mode
+    # boolean - keep the previous snapshot as <file>.prev on every write
+    __double_buffer = os.getenv("HBNB_FILE_DOUBLE_BUFFER") == "1"
+    # string - snapshot format written by save(), "json" or "columnar"
+    __format = os.getenv("HBNB_FILE_FORMAT", "json")
+    # boolean - map the JSON snapshot and build objects on first access
+    __lazy = os.getenv("HBNB_FILE_LAZY") == "1"
+    # dictionary - <class name> -> {key: (view, start, end)} of the objects
+    # not built yet and where their JSON text is in the mapped snapshot
+    __unloaded = {}
+    # boolean - append changes to a journal instead of rewriting the file
+    __journal = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal size in bytes past which it is compacted
+    __journal_max = int(os.getenv("HBNB_FILE_JOURNAL_MAX", 4 * 1024 * 1024))
+    # dictionary - keys changed since the last save -> obj, None if deleted
+    __dirty = {}
+    # dictionary - <class name>.id -> (obj, JSON text of obj when last saved)
+    __cache = {}
+    # dictionary - counters of objects serialised by save()
+    __metrics = {"saves": 0, "serialised": 0, "last_serialised": 0}
+    # float - seconds during which save() calls are coalesced, 0 to disable
+    __group_window = float(os.getenv("HBNB_GROUP_COMMIT_MS", 0)) / 1000
+    # dictionary - batch being collected, flushed and failed batch numbers
+    __group = {"open": 0, "leading": False, "durable": -1, "error": None}
+    __group_cond = threading.Condition()
+    __flush_lock = threading.RLock()
+    # readers-writer lock - guards __objects and its indexes across threads
+    __lock = RWLock()
+    # dictionary - the files as last read or written by this process
+    __stamp = {"snapshot": None, "journal": None}
+    # string - tells the versions of this process from another's
+    __epoch = os.urandom(4).hex()
+    # dictionary - <class name> -> [changes, time of the last change]
+    __versions = {}
+    # list - callables called with the name of every class changed
+    __watchers = []
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
+    def all(self, cls=None, load=None, order_by=None):
+        """returns the dictionary __objects, or a copy of one class; with
+        order_by, the objects of each class sorted by that attribute;
+        load is accepted for DBStorage parity, relationships are in
+        memory"""
+        if cls is None and order_by is not None:
+            objs = {}
+            for name in classes:
+                objs.update(self.all(name, order_by=order_by))
+            return objs
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            if type(cls) is not str:
+                cls = cls.__name__
+            self.__build(cls)
+            if order_by in self.__order_attrs:
+                with self.__lock.read():
+                    objs = self.__ordered_dicts.get((cls, order_by))
+                    if objs is not None and len(objs) == len(
+                            self.__by_class.get(cls, {})):
+                        return dict(objs)
+                if objs is None:
+                    with self.__lock.write():
+                        with self.__sorted(cls, order_by) as ordered:
+                            keys = [cls + "." + id for value, id in ordered]
+                        objs = {key: self.__objects[key] for key in keys}
+                        self.__ordered_dicts[(cls, order_by)] = objs
+                        if len(objs) == len(self.__by_class.get(cls, {})):
+                            return dict(objs)
+            with self.__lock.read():
+                objs = dict(self.__by_class.get(cls, {}))
+            if order_by is not None:
+                objs = dict(sorted(objs.items(), key=lambda item: (
+                    self.__sortable(getattr(item[1], order_by, None)),
+                    item[1].id)))
+            return objs
+        self.__build(*self.__unloaded)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock.write():
+                self.__put(key, obj)
+                self.__dirty[key] = obj
+
+    def bulk_new(self, objs):
+        """sets in __objects every obj of objs, taking the lock once"""
+        with self.__lock.write():
+            for obj in objs:
+                key = obj.__class__.__name__ + "." + obj.id
+                self.__put(key, obj)
+                self.__dirty[key] = obj
+
+    def __put(self, key, obj):
+        """stores obj under key and indexes it"""
+        if key in self.__objects:
+            self.__unindex(key, self.__objects[key])
+        self.__index(key, obj)
+        self.__objects[key] = obj
+        self.__by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        self.__bump(obj.__class__.__name__)
+        if self.__unloaded:
+            self.__unloaded.get(obj.__class__.__name__, {}).pop(key, None)
+
+    def __build(self, *names):
+        """builds the objects of the named classes not built yet"""
+        if not any(self.__unloaded.get(name) for name in names):
+            return
+        with self.__lock.write():
+            for name in names:
+                for key, entry in self.__unloaded.pop(name, {}).items():
+                    self.__put(key, self.__parse(entry))
+
+    def __build_key(self, key):
+        """builds the object stored under key if not built yet"""
+        name = key.split(".", 1)[0]
+        if key not in self.__unloaded.get(name, {}):
+            return
+        with self.__lock.write():
+            entry = self.__unloaded.get(name, {}).pop(key, None)
+            if entry is not None:
+                self.__put(key, self.__parse(entry))
+
+    def __parse(self, entry):
+        """returns the object whose JSON text is at (view, start, end)"""
+        view, start, end = entry
+        jo = json.loads(view[start:end])
+        return classes[jo["__class__"]](**jo)
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, "w") as f:
-            json.dump(json_objects, f)
+        if self.__group_window:
+            self.__group_commit()
+        else:
+            with self.__flush_lock:
+                self.__flush()
+
+    def bulk_save(self, objs):
+        """adds objs and writes them to disk with a single save"""
+        self.bulk_new(objs)
+        self.save()
+
+    def __group_commit(self):
+        """returns once a flush started after this call has completed"""
+        # the first caller of a batch waits out the window, then flushes
+        # once for every caller that joined the batch meanwhile
+        group = self.__group
+        with self.__group_cond:
+            batch = group["open"]
+            if group["leading"]:
+                while group["durable"] < batch:
+                    self.__group_cond.wait()
+                if group["error"] and group["error"][0] == batch:
+                    raise group["error"][1]
+                return
+            group["leading"] = True
+        time.sleep(self.__group_window)
+        with self.__group_cond:
+            group["open"] += 1
+            group["leading"] = False
+        try:
+            with self.__flush_lock:
+                self.__flush()
+        except Exception as e:
+            group["error"] = (batch, e)
+            raise
+        finally:
+            with self.__group_cond:
+                group["durable"] = max(group["durable"], batch)
+                self.__group_cond.notify_all()
+
+    def __flush(self):
+        """writes the changes made since the last flush to disk"""
+        self.__metrics["saves"] += 1
+        self.__metrics["last_serialised"] = 0
+        if self.__journal:
+            self.__append()
+        else:
+            self.__snapshot()
+
+    def __take_dirty(self):
+        """returns the dirty marks and clears them before serialising"""
+        with self.__lock.write():
+            dirty = dict(self.__dirty)
+            self.__dirty.clear()
+        return dirty
+
+    def __serialise(self, key, obj, dirty):
+        """returns the JSON text of obj, reusing the cached one if clean"""
+        cached = self.__cache.get(key)
+        if cached and cached[0] is obj and not dirty:
+            return cached[1]
+        text = json.dumps(obj.to_dict())
+        self.__cache[key] = (obj, text)
+        self.__metrics["serialised"] += 1
+        self.__metrics["last_serialised"] += 1
+        return text
+
+    def __snapshot(self):
+        """rewrites the JSON file with every object and drops the journal"""
+        dirty = self.__take_dirty()
+        if self.__format == "columnar":
+            self.__build(*self.__unloaded)
+        with self.__lock.read():
+            items = list(self.__objects.items())
+            unloaded = [item for name in self.__unloaded
+                        for item in self.__unloaded[name].items()]
+        if self.__format == "columnar":
+            self.__replace(snapshot.encode(obj for key, obj in items))
+        else:
+            texts = [(key, self.__serialise(key, obj, key in dirty))
+                     for key, obj in items]
+            # objects never built are copied from the old snapshot as is
+            texts += [(key, view[start:end].decode())
+                      for key, (view, start, end) in unloaded]
+            offsets, position, pieces = {}, 1, []
+            for key, text in texts:
+                piece = json.dumps(key) + ": " + text
+                size = len(text) if text.isascii() else len(text.encode())
+                start = position + len(piece) - len(text)
+                offsets[key] = (start, start + size)
+                position = start + size + 2
+                pieces.append(piece)
+            self.__replace("{" + ", ".join(pieces) + "}")
+        if os.path.exists(self.__file_path + ".journal"):
+            os.remove(self.__file_path + ".journal")
+        self.__stamp["snapshot"] = self.__stat(self.__file_path)
+        self.__stamp["journal"] = None
+        if self.__lazy and self.__format != "columnar":
+            self.__write_index(offsets)
+            if unloaded:
+                self.__remap(offsets)
+
+    def __write_index(self, offsets):
+        """writes where each object is in the snapshot just written"""
+        index = {"snapshot": self.__stamp["snapshot"], "offsets": offsets}
+        with open(self.__file_path + ".index", "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+
+    def __remap(self, offsets):
+        """points the objects not built yet into the new snapshot"""
+        with open(self.__file_path, "rb") as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with self.__lock.write():
+            for unloaded in self.__unloaded.values():
+                for key in unloaded:
+                    unloaded[key] = (view,) + offsets[key]
+
+    def __append(self):
+        """appends the objects changed since the last save to the journal"""
+        dirty = self.__take_dirty()
+        if not dirty:
+            return
+        records = []
+        for key, obj in dirty.items():
+            text = self.__serialise(key, obj, True) if obj else "null"
+            records.append('{"key": ' + json.dumps(key) +
+                           ', "obj": ' + text + '}\n')
+        with open(self.__file_path + ".journal", "a") as f:
+            st = os.fstat(f.fileno())
+            f.write("".join(records))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        read = self.__stamp["journal"] or (st.st_ino, 0)
+        if read == (st.st_ino, st.st_size):
+            # every earlier record was read, so close() can skip ours
+            self.__stamp["journal"] = (st.st_ino, size)
+        if size > self.__journal_max:
+            self.__snapshot()
+
+    def __replace(self, text):
+        """atomically replaces the JSON file with text"""
+        path = self.__file_path
+        directory = os.path.dirname(path) or "."
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                   dir=directory)
+        try:
+            # mkstemp creates the file readable by its owner only
+            try:
+                os.fchmod(fd, os.stat(path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.fchmod(fd, self.__mode)
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            if self.__double_buffer and os.path.exists(path):
+                # hard link the current snapshot so it survives the rename
+                os.link(path, tmp + ".prev")
+                os.replace(tmp + ".prev", path + ".prev")
+            os.replace(tmp, path)
+        except BaseException:
+            for name in [tmp, tmp + ".prev"]:
+                if os.path.exists(name):
+                    os.remove(name)
+            raise
+        # the rename itself is only durable once the directory is synced
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def metrics(self):
+        """returns the counters of objects serialised by save()"""
+        return dict(self.__metrics)
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file and replays its journal to __objects"""
+        with self.__flush_lock:
+            mapped = self.__map() if self.__lazy else None
+            if mapped is not None:
+                stamp, view, offsets = mapped
+                objs = self.__map_objects(view, offsets)
+            else:
+                stamp = self.__stat(self.__file_path)
+                jo = self.__load()
+                if snapshot.is_columnar(jo):
+                    objs = snapshot.decode(jo, classes)
+                else:
+                    objs = [(key, classes[jo[key]["__class__"]](**jo[key]))
+                            for key in jo]
+            journal, records = self.__replay()
+            self.__apply(objs + records)
+            self.__stamp["snapshot"] = stamp
+            self.__stamp["journal"] = journal
+
+    def __map(self):
+        """maps the JSON snapshot, returns its stamp, view and the offsets
+        of each object in it, or None if it can only be loaded eagerly"""
+        try:
+            with open(self.__file_path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_size == 0:
+                    return None
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        offsets = self.__read_index(stamp)
+        if offsets is None:
+            try:
+                offsets = self.__scan(view)
+            except ValueError:
+                # a corrupt snapshot, leave it to the eager fallback
+                return None
+        if offsets is None:
+            return None
+        return stamp, view, offsets
+
+    def __read_index(self, stamp):
+        """returns the offsets of the index written with the snapshot that
+        has stamp, or None if there is no such index"""
+        try:
+            with open(self.__file_path + ".index", "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if tuple(index.get("snapshot") or ()) != stamp:
+            return None
+        return {key: tuple(offset)
+                for key, offset in index["offsets"].items()}
+
+    def __scan(self, view):
+        """returns the offsets of each object in the mapped JSON snapshot,
+        or None if it is not in a format whose objects can be located"""
+        text = view[:].decode()
+        if not text.isascii():
+            # character and byte offsets would differ
+            return None
+        decoder = json.JSONDecoder()
+        space = json.decoder.WHITESPACE.match
+        offsets = {}
+        i = space(text, 0).end()
+        if text[i] != "{":
+            raise ValueError("snapshot is not a JSON object")
+        i = space(text, i + 1).end()
+        while text[i] != "}":
+            key, i = decoder.raw_decode(text, i)
+            if key == snapshot.FORMAT:
+                return None
+            i = space(text, i).end()
+            if text[i] != ":":
+                raise ValueError("expected ':' in snapshot")
+            start = space(text, i + 1).end()
+            value, i = decoder.raw_decode(text, start)
+            offsets[key] = (start, i)
+            i = space(text, i).end()
+            if text[i] == ",":
+                i = space(text, i + 1).end()
+            elif text[i] != "}":
+                raise ValueError("expected ',' or '}' in snapshot")
+        return offsets
+
+    def __map_objects(self, view, offsets):
+        """leaves the objects at offsets in view to be built on first access
+        and returns those already built here, read again from the view"""
+        objs = []
+        unloaded = {}
+        for key, (start, end) in offsets.items():
+            if key in self.__objects:
+                objs.append((key, self.__parse((view, start, end))))
+            else:
+                name = key.split(".", 1)[0]
+                unloaded.setdefault(name, {})[key] = (view, start, end)
+        with self.__lock.write():
+            self.__unloaded.clear()
+            for name, entries in unloaded.items():
+                self.__unloaded[name] = {
+                    key: entry for key, entry in entries.items()
+                    if key not in self.__dirty and key not in self.__objects}
+        return objs
+
+    def __replay(self, offset=0):
+        """returns the journal position after offset and the records there"""
+        records = []
+        try:
+            with open(self.__file_path + ".journal", "rb") as f:
+                ino = os.fstat(f.fileno()).st_ino
+                f.seek(offset)
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # a torn last record from a crash during an append
+                        break
+                    key, jo = record["key"], record["obj"]
+                    if jo is not None:
+                        jo = classes[jo["__class__"]](**jo)
+                    records.append((key, jo))
+                    offset += len(line)
+        except FileNotFoundError:
+            return None, records
+        return (ino, offset), records
+
+    def __apply(self, records):
+        """stores each (key, obj) record, removing keys whose obj is None"""
+        with self.__lock.write():
+            for key, obj in records:
+                if key in self.__dirty:
+                    # unsaved changes made in this process win
+                    continue
+                if obj is None:
+                    self.__remove(key)
+                else:
+                    self.__put(key, obj)
+
+    def __stat(self, path):
+        """returns what identifies the current version of path, if any"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def __load(self):
+        """returns the snapshot, falling back to <file>.prev if corrupt"""
         try:
             with open(self.__file_path, "r") as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            if not os.path.exists(self.__file_path + ".prev"):
+                raise
+        with open(self.__file_path + ".prev", "r") as f:
+            return json.load(f)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            self.__build_key(key)
+            with self.__lock.write():
+                if key in self.__objects:
+                    self.__remove(key)
+                    self.__dirty[key] = None
+
+    def __remove(self, key):
+        """removes the object stored under key and unindexes it"""
+        obj = self.__objects.pop(key, None)
+        self.__cache.pop(key, None)
+        if self.__unloaded:
+            self.__unloaded.get(key.split(".", 1)[0], {}).pop(key, None)
+        if obj is not None:
+            self.__unindex(key, obj)
+            self.__by_class.get(obj.__class__.__name__, {}).pop(key, None)
+            self.__bump(obj.__class__.__name__)
+
+    def __bump(self, name):
+        """records a change to the objects of the class called name"""
+        version = self.__versions.setdefault(name, [0, 0])
+        version[0] += 1
+        version[1] = time.time()
+        for callback in self.__watchers:
+            callback(name)
+
+    def watch(self, callback):
+        """calls callback with the class name of every object added,
+        changed or removed from now on"""
+        self.__watchers.append(callback)
+
+    def version(self, cls):
+        """returns a tag that changes whenever a cls object is added,
+        changed or removed, and the time of the last such change"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        changes, modified = self.__versions.get(cls, (0, 0))
+        return ("{}-{}".format(self.__epoch, changes),
+                datetime.utcfromtimestamp(modified) if modified else None)
+
+    def versions(self, clss):
+        """returns the version() of each class of clss by name"""
+        names = [cls if type(cls) is str else cls.__name__ for cls in clss]
+        return {name: self.version(name) for name in names}
+
+    def __index(self, key, obj):
+        """adds obj to the foreign key and amenity indexes"""
+        name = obj.__class__.__name__
+        for attr in self.__fk_attrs:
+            value = self.__fk(getattr(obj, attr, None))
+            if value is not None:
+                index = self.__by_fk.setdefault((name, attr), {})
+                index.setdefault(value, {})[key] = obj
+        for amenity_id in self.__ids(getattr(obj, "amenity_ids", None)):
+            self.__by_amenity.setdefault(amenity_id, {})[key] = obj
+        for attr in self.__order_attrs:
+            if hasattr(obj, attr):
+                self.__order(name, attr, getattr(obj, attr), obj.id)
+
+    def __unindex(self, key, obj):
+        """removes obj from the foreign key and amenity indexes"""
+        name = obj.__class__.__name__
+        for attr in self.__fk_attrs:
+            bucket = self.__by_fk.get((name, attr), {}).get(
+                self.__fk(getattr(obj, attr, None)))
+            if bucket is not None:
+                bucket.pop(key, None)
+        for amenity_id in self.__ids(getattr(obj, "amenity_ids", None)):
+            self.__by_amenity.get(amenity_id, {}).pop(key, None)
+        for attr in self.__order_attrs:
+            if hasattr(obj, attr):
+                self.__unorder(name, attr, getattr(obj, attr), obj.id)
+
+    @staticmethod
+    def __fk(value):
+        """returns value as the foreign key indexes hold it: ids are
+        strings, anything else a client sent is not indexed"""
+        return value if type(value) is str else None
+
+    @staticmethod
+    def __ids(value):
+        """returns the ids of an amenity_ids value, none if it is not a
+        list of strings"""
+        if type(value) not in (list, tuple):
+            return []
+        return [id for id in value if type(id) is str]
+
+    @staticmethod
+    def __sortable(value):
+        """returns value as the sorted lists compare it: strings ignore
+        case, like Jinja's sort filter and MySQL's default collation, and
+        values that are not datetimes compare as strings"""
+        if isinstance(value, str):
+            return value.lower()
+        if isinstance(value, datetime):
+            return value
+        return "" if value is None else str(value).lower()
+
+    @contextmanager
+    def __sorted(self, name, attr):
+        """holds the read lock over the (value, id) list of name objects
+        sorted by attr, sorting it first if needed"""
+        while True:
+            with self.__lock.read():
+                # checked again under the lock the list is read with
+                if (name, attr) not in self.__unsorted:
+                    yield self.__ordered.get((name, attr), [])
+                    return
+            with self.__lock.write():
+                if (name, attr) in self.__unsorted:
+                    self.__ordered[(name, attr)].sort()
+                    self.__unsorted.discard((name, attr))
+
+    def __order(self, name, attr, value, id):
+        """adds (value, id) to the sorted list of name objects by attr"""
+        value = self.__sortable(value)
+        self.__ordered_dicts.pop((name, attr), None)
+        ordered = self.__ordered.setdefault((name, attr), [])
+        if ordered and (value, id) < ordered[-1]:
+            # sorting once on the next read is cheaper than inserting
+            self.__unsorted.add((name, attr))
+        ordered.append((value, id))
+
+    def __unorder(self, name, attr, value, id):
+        """removes (value, id) from the sorted list of name objects by attr"""
+        value = self.__sortable(value)
+        self.__ordered_dicts.pop((name, attr), None)
+        ordered = self.__ordered.get((name, attr), [])
+        if (name, attr) in self.__unsorted:
+            if (value, id) in ordered:
+                ordered.remove((value, id))
+            return
+        i = bisect.bisect_left(ordered, (value, id))
+        if i < len(ordered) and ordered[i] == (value, id):
+            del ordered[i]
+
+    def changed(self, obj, attr, old):
+        """records that obj.attr changed and updates the indexes"""
+        name = obj.__class__.__name__
+        key = name + "." + str(obj.__dict__.get("id"))
+        if self.__objects.get(key) is not obj:
+            return
+        with self.__lock.write():
+            if self.__objects.get(key) is not obj:
+                return
+            self.__dirty[key] = obj
+            self.__bump(name)
+            if attr in self.__fk_attrs:
+                index = self.__by_fk.setdefault((name, attr), {})
+                index.get(self.__fk(old), {}).pop(key, None)
+                value = self.__fk(getattr(obj, attr))
+                if value is not None:
+                    index.setdefault(value, {})[key] = obj
+            elif attr == "amenity_ids":
+                for amenity_id in self.__ids(old):
+                    self.__by_amenity.get(amenity_id, {}).pop(key, None)
+                for amenity_id in self.__ids(obj.amenity_ids):
+                    self.__by_amenity.setdefault(amenity_id, {})[key] = obj
+            elif attr in self.__order_attrs:
+                self.__unorder(name, attr, old, obj.id)
+                self.__order(name, attr, getattr(obj, attr), obj.id)
+
+    def lookup(self, cls, attr, value):
+        """returns the dictionary of cls objects whose attr equals value"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        self.__build(cls)
+        with self.__lock.read():
+            if attr in self.__fk_attrs:
+                return dict(self.__by_fk.get((cls, attr), {}).get(value, {}))
+            objs = list(self.__by_class.get(cls, {}).items())
+        return {key: obj for key, obj in objs
+                if getattr(obj, attr, None) == value}
+
+    def query(self, cls):
+        """returns a Query on the cls objects, run against the indexes;
+        strings sort ignoring case, as they do in the sorted indexes"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        return Query(cls, self.__run)
+
+    def __run(self, query, count):
+        """returns the objects matching query, or their number if count"""
+        cls = query.cls
+        self.__build(cls)
+        if not query.filters and not count and len(query.ordering) == 1:
+            attr, descending = query.ordering[0]
+            if attr in self.__order_attrs and not descending:
+                with self.__sorted(cls, attr) as ordered:
+                    if len(ordered) == len(self.__by_class.get(cls, {})):
+                        return [self.__objects[cls + "." + id]
+                                for value, id in ordered[:query.size]]
+        objs = [obj for obj in self.__candidates(query)
+                if query.matches(obj)]
+        if count:
+            return len(objs)
+        if query.ordering or query.size is not None:
+            objs.sort(key=lambda obj: obj.id)
+        for attr, descending in reversed(query.ordering):
+            objs.sort(key=lambda obj: self.__sort_key(
+                getattr(obj, attr, None)), reverse=descending)
+        return objs[:query.size]
+
+    @staticmethod
+    def __sort_key(value):
+        """returns what queries sort value by: missing values first, as
+        in SQL, and strings ignoring case, as in the sorted indexes.
+        Values of different types, which a column would not hold, sort
+        numbers, then strings, then datetimes, then anything else"""
+        if value is None:
+            return (0, 0)
+        if isinstance(value, (int, float)):
+            return (1, value)
+        if isinstance(value, str):
+            return (2, value.lower())
+        if isinstance(value, datetime):
+            return (3, value)
+        return (4, str(value))
+
+    def __candidates(self, query):
+        """returns the cls objects the id or a foreign key index narrows
+        query down to, all of them if no filter can use one"""
+        cls = query.cls
+        for attr, op, operand in query.filters:
+            if op not in ("eq", "in"):
+                continue
+            values = [operand] if op == "eq" else operand
+            if any(type(value) is not str for value in values):
+                # the indexes only hold ids, e.g. not None for IS NULL
+                continue
+            values = dict.fromkeys(values)
+            if attr == "id":
+                with self.__lock.read():
+                    return [self.__objects[key] for key in
+                            (cls + "." + str(id) for id in values)
+                            if key in self.__objects]
+            if attr in self.__fk_attrs:
+                with self.__lock.read():
+                    index = self.__by_fk.get((cls, attr), {})
+                    return [obj for value in values
+                            for obj in index.get(value, {}).values()]
+        with self.__lock.read():
+            return list(self.__by_class.get(cls, {}).values())
+
+    def page(self, cls, limit, after=None, **filters):
+        """returns up to limit cls objects matching filters, ordered by
+        (created_at, id) and starting after the cursor tuple after"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        if filters:
+            return self.__keyset(self.__filter(cls, filters), limit, after)
+        self.__build(cls)
+        with self.__sorted(cls, "created_at") as ordered:
+            start = bisect.bisect_right(ordered, after) if after else 0
+            return [self.__objects[cls + "." + id]
+                    for value, id in ordered[start:start + limit]]
+
+    def iterate(self, cls, **filters):
+        """yields the cls objects matching filters one at a time"""
+        if filters:
+            yield from self.__filter(cls, filters)
+        else:
+            yield from self.all(cls).values()
+
+    def __filter(self, cls, filters):
+        """returns the list of cls objects whose attributes match filters"""
+        attr, value = next(iter(filters.items()))
+        return [obj for obj in self.lookup(cls, attr, value).values()
+                if all(getattr(obj, attr, None) == value
+                       for attr, value in filters.items())]
+
+    def __keyset(self, objs, limit, after):
+        """returns up to limit of objs ordered by (created_at, id) after"""
+        objs = sorted(objs, key=lambda obj: (obj.created_at, obj.id))
+        if after:
+            keys = [(obj.created_at, obj.id) for obj in objs]
+            objs = objs[bisect.bisect_right(keys, after):]
+        return objs[:limit]
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
+        """reloads the JSON file only if it changed since last read"""
+        with self.__flush_lock:
+            self.__refresh()
+
+    def __refresh(self):
+        """reloads the snapshot or applies new journal records if changed"""
+        stamp = self.__stamp
+        if self.__stat(self.__file_path) != stamp["snapshot"]:
+            self.reload()
+            return
+        journal = self.__stat(self.__file_path + ".journal")
+        if journal is None and stamp["journal"] is None:
+            return
+        if journal and stamp["journal"] and journal[0] == stamp["journal"][0]:
+            if journal[2] == stamp["journal"][1]:
+                return
+            if journal[2] > stamp["journal"][1]:
+                # only new records were appended, apply just those
+                position, records = self.__replay(stamp["journal"][1])
+                self.__apply(records)
+                stamp["journal"] = position
+                return
         self.reload()
 
-    def get(self, cls, id):
-        """retrieve one object"""
+    def get(self, cls, id, load=None):
+        """retrieve one object, load is accepted for DBStorage parity"""
         if cls in classes.values() and id and type(id) == str:
-            all_objects = self.all(cls)
-            for obj in all_objects.values():
-                if obj.id == id:
-                    return obj
+            key = cls.__name__ + "." + id
+            obj = self.__objects.get(key)
+            if obj is None and self.__unloaded:
+                self.__build_key(key)
+                obj = self.__objects.get(key)
+            return obj
         return None
 
     def count(self, cls=None):
         """count the number of objects in storage"""
-        objects = {}
         if cls in classes.values():
-            objects = self.all(cls)
-        else:
-            objects = self.all()
-        return len(objects)
+            return self.counts([cls])[cls.__name__]
+        return len(self.__objects) + sum(
+            len(unloaded) for unloaded in list(self.__unloaded.values()))
+
+    def counts(self, clss=None):
+        """count the objects of each class"""
+        if clss is None:
+            clss = classes.values()
+        return {c.__name__: len(self.__by_class.get(c.__name__, {})) +
+                len(self.__unloaded.get(c.__name__, {}))
+                for c in clss}
+
+    def search_places(self, states=None, cities=None, amenities=None,
+                      limit=None, after=None):
+        """returns the places in any of states or cities with all amenities,
+        a keyset page of them if limit is given"""
+        places = self.__search_places(states, cities, amenities)
+        if limit is None:
+            return places
+        return self.__keyset(places, limit, after)
+
+    def __search_places(self, states, cities, amenities):
+        """returns the places in any of states or cities with all amenities"""
+        self.__build("City", "Place")
+        with self.__lock.read():
+            # each posting maps the keys of the places it allows to them
+            postings = []
+            if states or cities:
+                by_state = self.__by_fk.get(("City", "state_id"), {})
+                by_city = self.__by_fk.get(("Place", "city_id"), {})
+                city_ids = set(cities or [])
+                for state_id in states or []:
+                    city_ids.update(city.id for city in
+                                    by_state.get(state_id, {}).values())
+                places = {}
+                for city_id in city_ids:
+                    places.update(by_city.get(city_id, {}))
+                postings.append(places)
+            for amenity_id in set(amenities or []):
+                postings.append(self.__by_amenity.get(amenity_id, {}))
+            if not postings:
+                return list(self.__by_class.get("Place", {}).values())
+            postings.sort(key=len)
+            keys = postings[0].keys()
+            for posting in postings[1:]:
+                keys = keys & posting.keys()
+            return [postings[0][key] for key in keys]
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Contains the TimedQueuePool class
+"""
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool with empty statistics"""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__stats = {"checkouts": 0, "timeouts": 0,
+                        "wait_total": 0.0, "wait_max": 0.0}
+
+    def _do_get(self):
+        """checks out a connection, timing the wait for a free one"""
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self.__lock:
+                self.__stats["checkouts"] += 1
+                self.__stats["timeouts"] += timed_out
+                self.__stats["wait_total"] += wait
+                self.__stats["wait_max"] = max(self.__stats["wait_max"],
+                                               wait)
+
+    def stats(self):
+        """returns the pool occupancy and the checkout wait statistics"""
+        with self.__lock:
+            stats = dict(self.__stats)
+        checkouts = stats["checkouts"] or 1
+        stats["wait_avg"] = stats["wait_total"] / checkouts
+        stats.update({
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+        })
+        return stats
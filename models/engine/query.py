@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Contains the Query class
+"""
+
+
+def compare(value, op, operand):
+    """returns whether value op operand holds, with SQL's rules for
+    missing values: they only equal None and compare false otherwise"""
+    if value is None or (operand is None and op != "in"):
+        if op == "eq":
+            return value is None and operand is None
+        return op == "ne" and value is not None
+    try:
+        if op == "eq":
+            return value == operand
+        if op == "ne":
+            return value != operand
+        if op == "lt":
+            return value < operand
+        if op == "lte":
+            return value <= operand
+        if op == "gt":
+            return value > operand
+        if op == "gte":
+            return value >= operand
+        return value in operand
+    except TypeError:
+        return False
+
+
+class Query:
+    """the objects of one class matching filters, in order, built with
+    storage.query(cls).filter(...).order_by(...).limit(...) and run by
+    the storage engine when its results are asked for
+
+    filter() takes attr=value for equality and attr__<op>=value for the
+    operators ne, lt, lte, gt, gte and in. order_by() takes attribute
+    names, "-name" sorting in descending order. Ties are broken by id.
+    """
+
+    operators = ("eq", "ne", "lt", "lte", "gt", "gte", "in")
+
+    def __init__(self, cls, run):
+        """Instantiate a Query on all the cls objects, run(query, count)
+        returning the matching objects, or their number if count"""
+        self.cls = cls
+        self.run = run
+        # list - (attribute, operator, operand) that objects must match
+        self.filters = []
+        # list - (attribute, descending) to sort by, in order
+        self.ordering = []
+        # integer - maximum number of objects, None for all
+        self.size = None
+
+    def __copy(self):
+        """returns a new Query with the same class, filters and order"""
+        query = Query(self.cls, self.run)
+        query.filters = list(self.filters)
+        query.ordering = list(self.ordering)
+        query.size = self.size
+        return query
+
+    def filter(self, **conditions):
+        """returns this query restricted to the objects matching all of
+        conditions"""
+        query = self.__copy()
+        for name, operand in conditions.items():
+            attr, _, op = name.rpartition("__")
+            if not attr:
+                attr, op = op, "eq"
+            if op not in self.operators:
+                raise ValueError("unknown operator {}".format(op))
+            if op == "in":
+                operand = list(operand)
+            query.filters.append((attr, op, operand))
+        return query
+
+    def order_by(self, *attrs):
+        """returns this query sorted by attrs, "-attr" for descending"""
+        query = self.__copy()
+        query.ordering += [(attr.lstrip("-"), attr.startswith("-"))
+                           for attr in attrs]
+        return query
+
+    def limit(self, size):
+        """returns this query stopping after size objects"""
+        query = self.__copy()
+        query.size = size
+        return query
+
+    def matches(self, obj):
+        """returns whether obj matches every filter of this query"""
+        return all(compare(getattr(obj, attr, None), op, operand)
+                   for attr, op, operand in self.filters)
+
+    def all(self):
+        """returns the list of the matching objects"""
+        return self.run(self, False)
+
+    def first(self):
+        """returns the first matching object, None if there is none"""
+        objs = self.limit(1).all()
+        return objs[0] if objs else None
+
+    def count(self):
+        """returns the number of matching objects, ignoring the limit"""
+        return self.run(self, True)
+
+    def __iter__(self):
+        """iterates over the matching objects"""
+        return iter(self.all())
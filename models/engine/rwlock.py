@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Contains the RWLock class
+"""
+
+from contextlib import contextmanager
+import threading
+
+
+class RWLock:
+    """lets many threads read at once while writers get exclusive access
+
+    Waiting writers block new readers so they are not starved. A thread
+    may take the lock again while holding it, and may read while it
+    writes, but may not start writing while it reads.
+    """
+
+    def __init__(self):
+        """Instantiate an unlocked RWLock"""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+        self.__local = threading.local()
+
+    @contextmanager
+    def read(self):
+        """holds the lock shared for the duration of a with block"""
+        me = threading.get_ident()
+        held = getattr(self.__local, "reads", 0)
+        with self.__cond:
+            if not held and self.__writer != me:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers += 1
+        self.__local.reads = held + 1
+        try:
+            yield
+        finally:
+            self.__local.reads = held
+            with self.__cond:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """holds the lock exclusively for the duration of a with block"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer != me:
+                if getattr(self.__local, "reads", 0):
+                    raise RuntimeError("cannot write while holding a read")
+                self.__waiting += 1
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+                self.__waiting -= 1
+                self.__writer = me
+            self.__depth += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__depth -= 1
+                if not self.__depth:
+                    self.__writer = None
+                    self.__cond.notify_all()
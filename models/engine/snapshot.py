@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the columnar snapshot format of FileStorage and a converter
+between it and the JSON one, run by convert_snapshot.py. It does not
+import the models package, so that the converter does not load storage
+"""
+
+from datetime import datetime, timedelta
+import json
+
+# marks a columnar snapshot, a JSON one only has <class name>.id keys
+FORMAT = "__format__"
+EPOCH = datetime(1970, 1, 1)
+# format of the datetimes of a JSON snapshot, as BaseModel parses them
+TIME = "%Y-%m-%dT%H:%M:%S.%f"
+# attributes of a JSON snapshot that hold datetimes
+STAMPS = ("created_at", "updated_at")
+# instance attributes that are never written to a snapshot
+hidden = ("_sa_instance_state", "password")
+
+
+def micros(dt):
+    """returns dt as microseconds since the epoch"""
+    delta = dt - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def is_columnar(doc):
+    """returns True if the parsed snapshot doc is in the columnar format"""
+    return doc.get(FORMAT) == "columnar"
+
+
+def encode(objs):
+    """
+    returns the columnar snapshot text of objs
+    Objects are grouped by class and set of attributes, each group
+    stores its column names once and one list of values per object,
+    with datetimes as integer microseconds since the epoch
+    """
+    return encode_records((obj.__class__.__name__, obj.__dict__)
+                          for obj in objs)
+
+
+def encode_records(records):
+    """returns the columnar snapshot text of the (class name, attribute
+    dictionary) pairs of records"""
+    groups = {}
+    for name, values in records:
+        columns = tuple(sorted(key for key in values if key not in hidden))
+        group = (name, columns)
+        groups.setdefault(group, []).append([values[c] for c in columns])
+    doc = {FORMAT: "columnar", "classes": {}}
+    for (name, columns), rows in groups.items():
+        stamps = [i for i, column in enumerate(columns)
+                  if all(type(row[i]) is datetime for row in rows)]
+        for row in rows:
+            for i in stamps:
+                row[i] = micros(row[i])
+        doc["classes"].setdefault(name, []).append(
+            {"columns": columns, "datetimes": stamps, "rows": rows})
+    return json.dumps(doc, separators=(",", ":"))
+
+
+def decode(doc, classes):
+    """returns the (key, obj) pairs of the parsed columnar snapshot doc"""
+    objs = []
+    for name, values in decode_records(doc):
+        cls = classes[name]
+        # the values were already parsed and hashed when saved, so fill
+        # the instance without going through __init__
+        obj = cls.__new__(cls)
+        obj.__dict__.update(values)
+        objs.append((name + "." + obj.id, obj))
+    return objs
+
+
+def decode_records(doc):
+    """returns the (class name, attribute dictionary) pairs of the parsed
+    columnar snapshot doc"""
+    records = []
+    for name, groups in doc["classes"].items():
+        for group in groups:
+            columns, stamps = group["columns"], group["datetimes"]
+            for row in group["rows"]:
+                for i in stamps:
+                    row[i] = EPOCH + timedelta(microseconds=row[i])
+                records.append((name, dict(zip(columns, row))))
+    return records
+
+
+def convert(fmt, source, target):
+    """rewrites the snapshot file source as target in the format fmt,
+    working on the attribute dictionaries rather than on objects"""
+    with open(source, "r") as f:
+        doc = json.load(f)
+    if is_columnar(doc):
+        records = decode_records(doc)
+    else:
+        records = []
+        for jo in doc.values():
+            values = {key: value for key, value in jo.items()
+                      if key != "__class__" and key not in hidden}
+            for key in STAMPS:
+                if type(values.get(key)) is str:
+                    values[key] = datetime.strptime(values[key], TIME)
+            records.append((jo["__class__"], values))
+    if fmt == "columnar":
+        text = encode_records(records)
+    else:
+        objs = {}
+        for name, values in records:
+            jo = {key: value.isoformat(timespec="microseconds")
+                  if type(value) is datetime else value
+                  for key, value in values.items() if key not in hidden}
+            jo["__class__"] = name
+            objs[name + "." + values["id"]] = jo
+        text = json.dumps(objs)
+    with open(target, "w") as f:
+        f.write(text)
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Contains the TestJSONProviderDocs and TestJSONProvider classes
+"""
+
+from api.v1 import json_provider
+from dataclasses import make_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import pep8
+import unittest
+import uuid
+
+
+class TestJSONProviderDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_provider.py"""
+
+    def test_pep8_conformance_json_provider(self):
+        """Test that api/v1/json_provider.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/json_provider.py",
+                                    "tests/test_api/test_v1/"
+                                    "test_json_provider.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_json_provider_docstrings(self):
+        """Test for the json_provider.py module and class docstrings"""
+        self.assertTrue(len(json_provider.__doc__) >= 1)
+        Provider = json_provider.FastJSONProvider
+        self.assertTrue(len(Provider.__doc__) >= 1)
+        for name in ["dumps", "loads"]:
+            self.assertTrue(len(getattr(Provider, name).__doc__) >= 1)
+
+
+# a dataclass to serialize
+Point = make_dataclass("Point", ["x", "y"])
+
+
+class TestJSONProvider(unittest.TestCase):
+    """Test FastJSONProvider gives the output of Flask's provider"""
+
+    def setUp(self):
+        """Make a fast and a default provider"""
+        app = Flask(__name__)
+        self.fast = json_provider.FastJSONProvider(app)
+        self.default = DefaultJSONProvider(app)
+
+    def test_same_output(self):
+        """test values Flask's default() converts come out the same"""
+        values = [
+            {"b": 1, "a": [1.5, None, True, "é"]},
+            datetime(2020, 1, 2, 3, 4, 5),
+            date(2020, 1, 2),
+            Point(1, 2),
+            Decimal("1.10"),
+            uuid.UUID(int=1),
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(self.fast.loads(self.fast.dumps(value)),
+                                 self.default.loads(
+                                     self.default.dumps(value)))
+        self.assertEqual(self.fast.dumps(datetime(2020, 1, 2, 3, 4, 5)),
+                         '"Thu, 02 Jan 2020 03:04:05 GMT"')
+
+    def test_loads(self):
+        """test loads() reads str and bytes, and reports bad JSON"""
+        self.assertEqual(self.fast.loads('{"a": [1, 2]}'), {"a": [1, 2]})
+        self.assertEqual(self.fast.loads(b"[1]"), [1])
+        self.assertRaises(ValueError, self.fast.loads, "{")
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceTestCase class
+"""
+
+from api.v1.app import app
+import models
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import unittest
+
+
+class PlaceTestCase(unittest.TestCase):
+    """Stores a user, a state, a city, a place and n_reviews reviews of
+    it for the API to serve, and removes them, with every object given
+    to store(), after each test"""
+
+    # integer - number of reviews of the place
+    n_reviews = 0
+
+    def setUp(self):
+        """Store the place, its city, state, owner and reviews"""
+        self.client = app.test_client()
+        self.objs = []
+        self.user = self.store(User(email="a@b.c", password="pwd"))
+        self.state = self.store(State(name="Texas"))
+        self.city = self.store(City(name="Austin", state_id=self.state.id))
+        self.place = self.store(Place(name="Loft", user_id=self.user.id,
+                                      city_id=self.city.id))
+        self.reviews = [self.store(Review(text=str(i),
+                                          place_id=self.place.id,
+                                          user_id=self.user.id))
+                        for i in range(self.n_reviews)]
+
+    def store(self, obj):
+        """Save obj, to be removed after the test, and return it"""
+        obj.save()
+        self.objs.append(obj)
+        return obj
+
+    def tearDown(self):
+        """Remove the stored objects, the last stored first"""
+        for obj in reversed(self.objs):
+            found = models.storage.get(type(obj), obj.id)
+            if found is not None:
+                models.storage.delete(found)
+        models.storage.save()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Contains the TestBulkDocs and TestBulk classes
+"""
+
+from api.v1.app import app
+from api.v1.views import bulk
+import json
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+
+
+class TestBulkDocs(unittest.TestCase):
+    """Tests to check the documentation and style of bulk.py"""
+
+    def test_pep8_conformance_bulk(self):
+        """Test that api/v1/views/bulk.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/views/bulk.py",
+                                    "tests/test_api/test_v1/test_views/"
+                                    "test_bulk.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_bulk_docstrings(self):
+        """Test for the bulk.py module and functions docstrings"""
+        self.assertTrue(len(bulk.__doc__) >= 1)
+        for func in [bulk.read_items, bulk.create_bulk]:
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestBulk(unittest.TestCase):
+    """Test POST /<resource>/bulk creates all of its objects or none"""
+
+    def setUp(self):
+        """Store a state to create cities in"""
+        self.client = app.test_client()
+        self.state = State(name="Texas")
+        self.state.save()
+        self.url = "/api/v1/cities/bulk"
+
+    def tearDown(self):
+        """Remove the stored objects"""
+        for city in models.storage.query(City).filter(
+                state_id=self.state.id):
+            models.storage.delete(city)
+        models.storage.delete(models.storage.get(State, self.state.id))
+        models.storage.save()
+
+    def cities(self):
+        """Return the names of the cities of the state"""
+        return sorted(city.name for city in models.storage.query(
+            City).filter(state_id=self.state.id))
+
+    def test_json_array(self):
+        """test a JSON array creates every object"""
+        response = self.client.post(self.url, json=[
+            {"name": "Austin", "state_id": self.state.id},
+            {"name": "Dallas", "state_id": self.state.id}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(obj["name"] for obj in response.get_json()),
+                         ["Austin", "Dallas"])
+        self.assertEqual(self.cities(), ["Austin", "Dallas"])
+
+    def test_ndjson(self):
+        """test NDJSON creates one object a line"""
+        lines = [json.dumps({"name": name, "state_id": self.state.id})
+                 for name in ["Austin", "Dallas"]]
+        response = self.client.post(self.url, data="\n".join(lines) + "\n",
+                                    content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.cities(), ["Austin", "Dallas"])
+
+    def test_invalid_creates_nothing(self):
+        """test one invalid object fails the request and creates nothing"""
+        valid = {"name": "Austin", "state_id": self.state.id}
+        cases = [
+            ([valid, {"state_id": self.state.id}], 400),
+            ([valid, 1], 400),
+            ([valid, {"name": "Dallas", "state_id": "nope"}], 404),
+            ([valid, {"name": "Dallas", "state_id": [self.state.id]}], 404),
+            ([valid, {"name": "Dallas", "state_id": {}}], 404),
+        ]
+        for items, status in cases:
+            with self.subTest(items=items):
+                response = self.client.post(self.url, json=items)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(self.cities(), [])
+
+    def test_not_an_array(self):
+        """test a body that is not a JSON array or NDJSON is a 400"""
+        for kwargs in [{"json": {"name": "Austin"}},
+                       {"data": "not json"},
+                       {"data": "{}\nnot json\n",
+                        "content_type": "application/x-ndjson"}]:
+            with self.subTest(kwargs=kwargs):
+                response = self.client.post(self.url, **kwargs)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(self.cities(), [])
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+"""
+Contains the TestCachingDocs, TestEtag and TestResponseCache classes
+"""
+
+from api.v1.app import app
+from api.v1.views import caching
+import models
+from models.amenity import Amenity
+from models.state import State
+import pep8
+from sqlalchemy import event
+from tests.test_api.test_v1.test_views.place_case import PlaceTestCase
+import unittest
+
+
+class TestCachingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of caching.py"""
+
+    def test_pep8_conformance_caching(self):
+        """Test that api/v1/views/caching.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/views/caching.py",
+                                    "tests/test_api/test_v1/test_views/"
+                                    "test_caching.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_caching_docstrings(self):
+        """Test for the caching.py module, functions and class docstrings"""
+        self.assertTrue(len(caching.__doc__) >= 1)
+        for func in [caching.etag, caching.cached, caching.ResponseCache]:
+            self.assertTrue(len(func.__doc__) >= 1)
+        for name in ["lookup", "store", "invalidate", "stats"]:
+            self.assertTrue(
+                len(getattr(caching.ResponseCache, name).__doc__) >= 1)
+
+
+class TestEtag(PlaceTestCase):
+    """Test conditional GETs get a 304 until the objects change"""
+
+    def setUp(self):
+        """Store a place and an amenity"""
+        super().setUp()
+        self.amenity = self.store(Amenity(name="Wifi"))
+
+    def conditional(self, url):
+        """Return the ETag of url, checking it gets a 304 when sent"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        tag = response.get_etag()[0]
+        self.assertIsNotNone(tag)
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        return tag
+
+    def test_not_modified(self):
+        """test an unchanged object or list gets a 304"""
+        for url in ["/api/v1/places/{}".format(self.place.id),
+                    "/api/v1/cities/{}/places".format(self.city.id),
+                    "/api/v1/stats"]:
+            with self.subTest(url=url):
+                self.conditional(url)
+
+    def test_star(self):
+        """test If-None-Match: * gets a 304 for an object that exists and
+        lets a missing one get its 404"""
+        headers = {"If-None-Match": "*"}
+        response = self.client.get(
+            "/api/v1/places/{}".format(self.place.id), headers=headers)
+        self.assertEqual(response.status_code, 304)
+        for url in ["/api/v1/places/nope", "/api/v1/states/nope",
+                    "/api/v1/cities/nope/places"]:
+            with self.subTest(url=url):
+                response = self.client.get(url, headers=headers)
+                self.assertEqual(response.status_code, 404)
+
+    def test_update_modifies(self):
+        """test updating an object changes the ETag of its GET"""
+        url = "/api/v1/places/{}".format(self.place.id)
+        tag = self.conditional(url)
+        response = self.client.put(url, json={"name": "Barn"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Barn")
+
+    def test_link_modifies(self):
+        """test linking or unlinking an amenity changes the ETag of the
+        amenities of the place"""
+        url = "/api/v1/places/{}/amenities".format(self.place.id)
+        link = "{}/{}".format(url, self.amenity.id)
+        tag = self.conditional(url)
+        self.assertEqual(self.client.post(link).status_code, 201)
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([obj["id"] for obj in response.get_json()],
+                         [self.amenity.id])
+        tag = self.conditional(url)
+        self.assertEqual(self.client.delete(link).status_code, 200)
+        response = self.client.get(url, headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the response cache only serves responses still current"""
+
+    def setUp(self):
+        """Store a state"""
+        self.client = app.test_client()
+        self.state = State(name="Texas")
+        self.state.save()
+        self.url = "/api/v1/states/{}".format(self.state.id)
+
+    def tearDown(self):
+        """Remove the stored state"""
+        models.storage.delete(models.storage.get(State, self.state.id))
+        models.storage.save()
+
+    def hits(self):
+        """Return the number of hits of the response cache"""
+        return caching.response_cache.stats()["hits"]
+
+    def test_hit(self):
+        """test a second GET is served from the cache"""
+        self.client.get(self.url)
+        hits = self.hits()
+        response = self.client.get(self.url)
+        self.assertEqual(response.get_json()["name"], "Texas")
+        self.assertEqual(self.hits(), hits + 1)
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_statements(self):
+        """test a cached view reads the storage versions once per request,
+        in a single query"""
+        engine = models.storage._DBStorage__engine
+
+        def statements(url):
+            """Return how many statements a GET of url issues"""
+            models.storage.close()
+            executed = []
+
+            def record(*args):
+                """Record a statement"""
+                executed.append(args)
+
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+            return len(executed)
+
+        # the versions, then the counts; a hit only reads the versions
+        self.assertEqual(statements("/api/v1/stats"), 2)
+        self.assertEqual(statements("/api/v1/stats"), 1)
+
+    def test_unreported_change(self):
+        """test a change storage did not report, as one made by another
+        process, is not hidden by the cache"""
+        watchers = getattr(models.storage, "_{}__watchers".format(
+            type(models.storage).__name__))
+        watchers.remove(caching.response_cache.invalidate)
+        self.addCleanup(watchers.append, caching.response_cache.invalidate)
+        self.client.get(self.url)
+        state = models.storage.get(State, self.state.id)
+        state.name = "Utah"
+        state.save()
+        hits = self.hits()
+        response = self.client.get(self.url)
+        self.assertEqual(response.get_json()["name"], "Utah")
+        self.assertEqual(self.hits(), hits)
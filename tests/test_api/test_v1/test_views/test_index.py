@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestInternalStats classes
+"""
+
+from api.v1.app import app
+from api.v1.views import index
+import models
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of index.py"""
+
+    def test_pep8_conformance_index(self):
+        """Test that api/v1/views/index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/views/index.py",
+                                    "tests/test_api/test_v1/test_views/"
+                                    "test_index.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_index_docstrings(self):
+        """Test for the index.py module and functions docstrings"""
+        self.assertTrue(len(index.__doc__) >= 1)
+        for func in [index.status, index.count, index.internal,
+                     index.pool_stats, index.cache_stats]:
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestInternalStats(unittest.TestCase):
+    """Test the pool and cache statistics are only served when enabled"""
+
+    def setUp(self):
+        """Make a test client"""
+        self.client = app.test_client()
+
+    def test_disabled(self):
+        """test the statistics are hidden by default, even to 127.0.0.1"""
+        with mock.patch.dict(os.environ):
+            os.environ.pop("HBNB_API_INTERNAL_STATS", None)
+            for url in ["/api/v1/stats/pool", "/api/v1/stats/cache"]:
+                with self.subTest(url=url):
+                    response = self.client.get(
+                        url, environ_base={"REMOTE_ADDR": "127.0.0.1"})
+                    self.assertEqual(response.status_code, 404)
+
+    def test_enabled(self):
+        """test HBNB_API_INTERNAL_STATS=1 serves the statistics"""
+        with mock.patch.dict(os.environ, {"HBNB_API_INTERNAL_STATS": "1"}):
+            response = self.client.get("/api/v1/stats/cache")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("hits", response.get_json())
+            response = self.client.get("/api/v1/stats/pool")
+            if models.storage_t == "db":
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("class", response.get_json())
+            else:
+                self.assertEqual(response.status_code, 404)
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs and TestPagination classes
+"""
+
+from api.v1.views import pagination
+from base64 import urlsafe_b64encode
+import models
+from models.state import State
+import pep8
+from sqlalchemy import event
+from tests.test_api.test_v1.test_views.place_case import PlaceTestCase
+import unittest
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination.py"""
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/views/pagination.py",
+                                    "tests/test_api/test_v1/test_views/"
+                                    "test_pagination.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_pagination_docstrings(self):
+        """Test for the pagination.py module and functions docstrings"""
+        self.assertTrue(len(pagination.__doc__) >= 1)
+        for func in [pagination.encode_cursor, pagination.decode_cursor,
+                     pagination.paginate]:
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestPagination(PlaceTestCase):
+    """Test the limit and cursor query parameters of list endpoints"""
+
+    n_reviews = 5
+
+    def setUp(self):
+        """Store a place with five reviews"""
+        super().setUp()
+        self.url = "/api/v1/places/{}/reviews".format(self.place.id)
+
+    def walk(self, url, limit):
+        """Return the pages of url, following X-Next-Cursor"""
+        pages, cursor = [], None
+        while True:
+            query = {"limit": limit}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.client.get(url, query_string=query)
+            self.assertEqual(response.status_code, 200)
+            pages.append([obj["id"] for obj in response.get_json()])
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return pages
+
+    def test_pages(self):
+        """test the pages follow (created_at, id) through the cursors"""
+        pages = self.walk(self.url, 2)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        ordered = sorted(self.reviews, key=lambda review:
+                         (review.created_at, review.id))
+        self.assertEqual(sum(pages, []), [review.id for review in ordered])
+
+    def test_pages_cover_list(self):
+        """test paging through a whole class returns each object once"""
+        pages = self.walk("/api/v1/states", 3)
+        ids = sum(pages, [])
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), {state.id for state in
+                                    models.storage.all(State).values()})
+
+    def test_last_page(self):
+        """test a page holding the last object has no next cursor"""
+        response = self.client.get(self.url, query_string={"limit": 5})
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.get_json()), 5)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_invalid_limit(self):
+        """test a limit that is not between 1 and MAX_LIMIT is a 400"""
+        for limit in ["0", "-1", "two", "1.5",
+                      str(pagination.MAX_LIMIT + 1)]:
+            with self.subTest(limit=limit):
+                response = self.client.get(self.url,
+                                           query_string={"limit": limit})
+                self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        """test a cursor that was not given by the API is a 400"""
+        for cursor in ["not a cursor",
+                       urlsafe_b64encode(b'{"a": 1}').decode(),
+                       urlsafe_b64encode(b'["yesterday", "id"]').decode()]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, query_string={
+                    "limit": 2, "cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_page_reads_page(self):
+        """test a page only selects its reviews, not the whole list"""
+        engine = models.storage._DBStorage__engine
+        models.storage.close()
+        executed = []
+
+        def record(conn, cursor, statement, *args):
+            """Record a statement"""
+            executed.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = self.client.get(self.url, query_string={"limit": 2})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(len(response.get_json()), 2)
+        reads = [statement for statement in executed
+                 if "reviews.text" in statement]
+        self.assertTrue(reads)
+        for statement in reads:
+            self.assertIn("LIMIT", statement)
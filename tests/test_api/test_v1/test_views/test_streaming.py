@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+from api.v1.views import streaming
+import json
+import models
+import pep8
+from tests.test_api.test_v1.test_views.place_case import PlaceTestCase
+import unittest
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming.py"""
+
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/views/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["api/v1/views/streaming.py",
+                                    "tests/test_api/test_v1/test_views/"
+                                    "test_streaming.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_streaming_docstrings(self):
+        """Test for the streaming.py module and functions docstrings"""
+        self.assertTrue(len(streaming.__doc__) >= 1)
+        for func in [streaming.stream, streaming.json_chunks,
+                     streaming.ndjson_chunks]:
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestStreaming(PlaceTestCase):
+    """Test list endpoints stream their objects when asked to"""
+
+    n_reviews = 5
+
+    def setUp(self):
+        """Store a place with five reviews"""
+        super().setUp()
+        self.url = "/api/v1/places/{}/reviews".format(self.place.id)
+        self.ids = sorted(review.id for review in self.reviews)
+
+    def test_json_array(self):
+        """test ?stream=1 streams the same JSON array as the list"""
+        response = self.client.get(self.url, query_string={"stream": 1})
+        self.assertEqual(response.status_code, 200)
+        # a chunked response has no length
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(response.mimetype, "application/json")
+        streamed = response.get_json()
+        self.assertEqual(sorted(obj["id"] for obj in streamed), self.ids)
+        listed = self.client.get(self.url)
+        self.assertIn("Content-Length", listed.headers)
+        self.assertEqual(sorted(streamed, key=lambda obj: obj["id"]),
+                         sorted(listed.get_json(), key=lambda obj:
+                                obj["id"]))
+
+    def test_ndjson(self):
+        """test Accept: application/x-ndjson streams one object a line"""
+        response = self.client.get(self.url, headers={
+            "Accept": streaming.NDJSON})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, streaming.NDJSON)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(sorted(json.loads(line)["id"] for line in lines),
+                         self.ids)
+
+    def test_empty(self):
+        """test streaming no objects gives an empty array or body"""
+        for review in self.reviews:
+            models.storage.delete(review)
+        models.storage.save()
+        self.reviews = []
+        response = self.client.get(self.url, query_string={"stream": 1})
+        self.assertEqual(response.get_json(), [])
+        response = self.client.get(self.url, headers={
+            "Accept": streaming.NDJSON})
+        self.assertEqual(response.get_data(), b"")
+
+    def test_limit_wins(self):
+        """test a limit pages the list even if streaming is asked for"""
+        for headers, query in [({}, {"stream": 1, "limit": 2}),
+                               ({"Accept": streaming.NDJSON}, {"limit": 2})]:
+            with self.subTest(headers=headers, query=query):
+                response = self.client.get(self.url, headers=headers,
+                                           query_string=query)
+                self.assertIn("Content-Length", response.headers)
+                self.assertEqual(response.mimetype, "application/json")
+                self.assertEqual(len(response.get_json()), 2)
+                self.assertIn("X-Next-Cursor", response.headers)
@@ -1,11 +1,18 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the classes TestConsoleDocs and TestConsoleImport
 """
 
 import console
+from contextlib import redirect_stdout
 import inspect
+import io
+import json
+import models
+from models.state import State
+import os
 import pep8
+import tempfile
 import unittest
 HBNBCommand = console.HBNBCommand
 
@@ -39,3 +46,72 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsoleImport(unittest.TestCase):
+    """Class for testing the import command of the console"""
+
+    def setUp(self):
+        """Create a scratch directory for the files to import"""
+        self.directory = tempfile.mkdtemp()
+        self.names = ["import_{}".format(i) for i in range(3)]
+
+    def tearDown(self):
+        """Remove the imported states and the scratch directory"""
+        for state in models.storage.query(State).filter(
+                name__in=self.names):
+            models.storage.delete(state)
+        models.storage.save()
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def run_import(self, text, cls="State"):
+        """Return what importing a file holding text prints"""
+        path = os.path.join(self.directory, "objs.json")
+        with open(path, "w") as f:
+            f.write(text)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            HBNBCommand().onecmd("import {} {}".format(cls, path))
+        return out.getvalue().strip()
+
+    def imported(self):
+        """Return the names of the imported states"""
+        return sorted(state.name for state in models.storage.query(
+            State).filter(name__in=self.names))
+
+    def test_json_array(self):
+        """test a JSON array creates one object per item"""
+        text = json.dumps([{"name": name} for name in self.names])
+        self.assertEqual(self.run_import(text), "3")
+        self.assertEqual(self.imported(), self.names)
+
+    def test_ndjson(self):
+        """test NDJSON creates one object per line"""
+        text = "\n".join(json.dumps({"name": name})
+                         for name in self.names) + "\n"
+        self.assertEqual(self.run_import(text), "3")
+        self.assertEqual(self.imported(), self.names)
+
+    def test_not_objects(self):
+        """test items that are not objects create nothing"""
+        for text in ["[1, 2]", json.dumps([{"name": self.names[0]}, 3]),
+                     "[{\"name\": \"import_0\"}", "1\n"]:
+            with self.subTest(text=text):
+                self.assertEqual(self.run_import(text), "** invalid JSON **")
+                self.assertEqual(self.imported(), [])
+
+    def test_errors(self):
+        """test a missing class or file is reported"""
+        out = io.StringIO()
+        with redirect_stdout(out):
+            HBNBCommand().onecmd("import State {}".format(
+                os.path.join(self.directory, "nope.json")))
+        self.assertEqual(out.getvalue().strip(), "** file doesn't exist **")
+        self.assertEqual(self.run_import("[]", cls="Nope"),
+                         "** class doesn't exist **")
+        out = io.StringIO()
+        with redirect_stdout(out):
+            HBNBCommand().onecmd("import State")
+        self.assertEqual(out.getvalue().strip(), "** file name missing **")
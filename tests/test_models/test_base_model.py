@@ -138,6 +138,15 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_whole_seconds(self):
+        """test that to_dict keeps the microseconds of whole seconds"""
+        bm = BaseModel()
+        bm.created_at = datetime(2017, 9, 28, 21, 3, 54)
+        self.assertEqual(bm.to_dict()["created_at"],
+                         "2017-09-28T21:03:54.000000")
+        bm = BaseModel(**bm.to_dict())
+        self.assertEqual(bm.created_at, datetime(2017, 9, 28, 21, 3, 54))
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -14,9 +14,11 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import importlib
 import json
 import os
 import pep8
+from sqlalchemy import event
 import unittest
 
 DBStorage = db_storage.DBStorage
@@ -134,3 +136,164 @@ class TestFileStorage(unittest.TestCase):
         obj.save()
         new = models.storage.count()
         self.assertEqual(new, (old + 1))
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_counts(self):
+        """test counts() returns every class count in one query"""
+        old = models.storage.counts()
+        obj = State(name="Texas")
+        obj.save()
+        new = models.storage.counts()
+        self.assertEqual(new["State"], old["State"] + 1)
+        self.assertEqual(new["State"], models.storage.count(State))
+        self.assertEqual(sum(new.values()), models.storage.count())
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_version(self):
+        """test version() changes with every new, changed or deleted row
+        of its class and only then"""
+        tag, modified = models.storage.version(State)
+        self.assertEqual(models.storage.version("State")[0], tag)
+        state = State(name="Texas")
+        state.save()
+        tags = [tag, models.storage.version(State)[0]]
+        self.assertGreaterEqual(models.storage.version(State)[1],
+                                state.updated_at)
+        Amenity(name="Wifi").save()
+        self.assertEqual(models.storage.version(State)[0], tags[-1])
+        state.name = "Utah"
+        state.save()
+        tags.append(models.storage.version(State)[0])
+        models.storage.delete(state)
+        models.storage.save()
+        tags.append(models.storage.version(State)[0])
+        models.storage.bulk_save([State(name="Ohio")])
+        tags.append(models.storage.version(State)[0])
+        self.assertEqual(len(set(tags)), 5)
+        self.assertEqual(models.storage.version(State)[0], tags[-1])
+        self.assertEqual(models.storage.versions([State, "Amenity"]), {
+            "State": models.storage.version(State),
+            "Amenity": models.storage.version(Amenity)})
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_version_links(self):
+        """test linking or unlinking an amenity changes the versions of
+        both Place and Amenity"""
+        user = User(email="a@b.c", password="pwd")
+        user.save()
+        state = State(name="Texas")
+        state.save()
+        city = City(name="Austin", state_id=state.id)
+        city.save()
+        place = Place(name="Loft", city_id=city.id, user_id=user.id)
+        place.save()
+        amenity = Amenity(name="Wifi")
+        amenity.save()
+        for change in [place.amenities.append, place.amenities.remove]:
+            tags = [models.storage.version(cls)[0]
+                    for cls in [Place, Amenity, State]]
+            change(amenity)
+            models.storage.save()
+            new = [models.storage.version(cls)[0]
+                   for cls in [Place, Amenity, State]]
+            self.assertNotEqual(new[0], tags[0])
+            self.assertNotEqual(new[1], tags[1])
+            self.assertEqual(new[2], tags[2])
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_all_order_by(self):
+        """test all() with order_by returns the rows sorted by it"""
+        for name in ["b", "c", "a", "b"]:
+            Amenity(name=name).save()
+        User(email="a@b.c", password="pwd").save()
+        amenities = list(models.storage.all(Amenity,
+                                            order_by="name").values())
+        self.assertEqual(amenities, sorted(amenities, key=lambda amenity:
+                                           (amenity.name, amenity.id)))
+        self.assertEqual(len(amenities), models.storage.count(Amenity))
+        self.assertEqual(len(models.storage.all(User, order_by="name")),
+                         models.storage.count(User))
+        indexed = [index.columns.keys()
+                   for index in Amenity.__table__.indexes]
+        self.assertIn(["name"], indexed)
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_watch(self):
+        """test watch() reports the classes of the rows each commit added,
+        updated or deleted, and not those of a rollback"""
+        changes = []
+        models.storage.watch(changes.append)
+        self.addCleanup(models.storage._DBStorage__watchers.remove,
+                        changes.append)
+        state = State(name="Texas")
+        models.storage.new(state)
+        self.assertEqual(changes, [])
+        models.storage.save()
+        self.assertEqual(changes, ["State"])
+        state.name = "Utah"
+        models.storage.bulk_save([Amenity(name="Wifi")])
+        self.assertEqual(sorted(changes[1:]), ["Amenity", "State"])
+        models.storage.new(Amenity(name="Pool"))
+        # flush the amenity, then roll it back
+        models.storage.all(Amenity)
+        models.storage.close()
+        models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+        self.assertEqual(len(changes), 4)
+        self.assertEqual(changes[-1], "State")
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_load_statement_count(self):
+        """test all() and get() with load issue as many statements however
+        many related objects there are, and all() without it does not"""
+        engine = models.storage._DBStorage__engine
+        page = importlib.import_module("web_flask.8-cities_by_states")
+        client = page.app.test_client()
+
+        def statements(action):
+            """Return how many statements action issues in a new session"""
+            models.storage.close()
+            executed = []
+
+            def count(*args):
+                """Record a statement"""
+                executed.append(args)
+
+            event.listen(engine, "before_cursor_execute", count)
+            try:
+                action()
+            finally:
+                event.remove(engine, "before_cursor_execute", count)
+            return len(executed)
+
+        def walk(load):
+            """Touch the cities of every state"""
+            for state in models.storage.all(State, load=load).values():
+                [city.name for city in state.cities]
+
+        counts = []
+        for size in [2, 8]:
+            user = User(email="a@b.c", password="pwd")
+            user.save()
+            for i in range(size):
+                state = State(name="state")
+                state.save()
+                city = City(name="city", state_id=state.id)
+                city.save()
+                place = Place(name="Loft", city_id=city.id, user_id=user.id)
+                place.save()
+                for j in range(size):
+                    Review(text="ok", place_id=place.id,
+                           user_id=user.id).save()
+            counts.append((
+                statements(lambda: walk(["cities"])),
+                statements(lambda: walk(None)),
+                statements(lambda: client.get("/cities_by_states")),
+                statements(lambda: models.storage.get(
+                    Place, place.id, load=["reviews", "cities.state"]
+                ).reviews),
+            ))
+        self.assertEqual(counts[0][0], counts[1][0])
+        self.assertGreater(counts[1][1], counts[0][1])
+        self.assertEqual(counts[0][2], counts[1][2])
+        self.assertEqual(counts[0][3], counts[1][3])
@@ -15,9 +15,13 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import glob
 import os
 import pep8
+import sys
+import threading
 import unittest
+from unittest import mock
 
 FileStorage = file_storage.FileStorage
 classes = {
@@ -102,12 +106,47 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(type(new_dict), dict)
         self.assertIs(new_dict, storage._FileStorage__objects)
 
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_all_order_by(self):
+        """test all() with order_by returns the objects sorted by it"""
+        names = ["b", "C", "a", "b", "A"]
+        for name in names:
+            Amenity(name=name).save()
+        user = User(email="a@b.c", password="pwd")
+        user.save()
+        amenity = Amenity(name="~")
+        amenity.save()
+        before = list(models.storage.all(Amenity, order_by="name"))
+        self.assertEqual(before[-1], "Amenity." + amenity.id)
+        amenity.name = "0"
+
+        def key(obj):
+            """Return the sort key of all(order_by="name")"""
+            return (obj.name.lower(), obj.id)
+
+        amenities = list(models.storage.all(Amenity,
+                                            order_by="name").values())
+        self.assertEqual(amenities, sorted(amenities, key=key))
+        self.assertEqual(len(amenities), models.storage.count(Amenity))
+        self.assertIs(amenities[0], amenity)
+        users = models.storage.all("User", order_by="name")
+        self.assertEqual(users, models.storage.all(User))
+        ordered = list(models.storage.all(order_by="created_at").values())
+        self.assertEqual(len(ordered), models.storage.count())
+        self.assertLess(ordered.index(amenity), ordered.index(user))
+
     @unittest.skipIf(models.storage_t == "db", "not testing file storage")
     def test_new(self):
         """test that new adds an object to the FileStorage.__objects attr"""
         storage = FileStorage()
         save = FileStorage._FileStorage__objects
+        save_by_class = FileStorage._FileStorage__by_class
+        save_by_fk = FileStorage._FileStorage__by_fk
+        save_ordered = FileStorage._FileStorage__ordered
         FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__by_class = {}
+        FileStorage._FileStorage__by_fk = {}
+        FileStorage._FileStorage__ordered = {}
         test_dict = {}
         for key, value in classes.items():
             with self.subTest(key=key, value=value):
@@ -116,7 +155,11 @@ class TestFileStorage(unittest.TestCase):
                 storage.new(instance)
                 test_dict[instance_key] = instance
                 self.assertEqual(test_dict, storage._FileStorage__objects)
+                self.assertEqual(storage.all(value), {instance_key: instance})
         FileStorage._FileStorage__objects = save
+        FileStorage._FileStorage__by_class = save_by_class
+        FileStorage._FileStorage__by_fk = save_by_fk
+        FileStorage._FileStorage__ordered = save_ordered
 
     @unittest.skipIf(models.storage_t == "db", "not testing file storage")
     def test_save(self):
@@ -154,6 +197,16 @@ class TestFileStorage(unittest.TestCase):
         result = models.storage.get("DUMB_CLASS", obj.id)
         self.assertEqual(result, None)
 
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_get_by_key(self):
+        """test get() only matches objects of the requested class"""
+        obj = State(name="Texas")
+        models.storage.new(obj)
+        self.assertIs(models.storage.get(State, obj.id), obj)
+        self.assertIsNone(models.storage.get(City, obj.id))
+        models.storage.delete(obj)
+        self.assertIsNone(models.storage.get(State, obj.id))
+
     def test_count(self):
         """test count() method"""
         old = models.storage.count()
@@ -161,3 +214,477 @@ class TestFileStorage(unittest.TestCase):
         obj.save()
         new = models.storage.count()
         self.assertEqual(new, (old + 1))
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_all_cls_partition(self):
+        """test all(cls) and count(cls) only see objects of that class"""
+        old = models.storage.count(City)
+        state = State(name="Texas")
+        city = City(name="Austin", state_id=state.id)
+        models.storage.new(state)
+        models.storage.new(city)
+        self.assertIn("City." + city.id, models.storage.all(City))
+        self.assertIn("City." + city.id, models.storage.all("City"))
+        self.assertNotIn("State." + state.id, models.storage.all(City))
+        self.assertEqual(models.storage.count(City), old + 1)
+        models.storage.delete(city)
+        self.assertNotIn("City." + city.id, models.storage.all(City))
+        self.assertEqual(models.storage.count(City), old)
+        models.storage.delete(state)
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_lookup_foreign_key(self):
+        """test lookup() follows new(), delete() and attribute updates"""
+        state = State(name="Texas")
+        other = State(name="Ohio")
+        city = City(name="Austin", state_id=state.id)
+        for obj in [state, other, city]:
+            models.storage.new(obj)
+        key = "City." + city.id
+        self.assertEqual(models.storage.lookup(City, "state_id", state.id),
+                         {key: city})
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        models.storage.delete(city)
+        self.assertEqual(other.cities, [])
+        self.assertEqual(models.storage.lookup(City, "name", "Austin"), {})
+        models.storage.delete(state)
+        models.storage.delete(other)
+
+    def test_counts(self):
+        """test counts() matches count() for every class"""
+        counts = models.storage.counts([State, City])
+        self.assertEqual(counts, {"State": models.storage.count(State),
+                                  "City": models.storage.count(City)})
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_version(self):
+        """test version() changes with every new, changed or deleted object
+        of its class and only then"""
+        tag, modified = models.storage.version(State)
+        self.assertEqual(models.storage.version("State")[0], tag)
+        state = State(name="Texas")
+        state.save()
+        tags = [tag, models.storage.version(State)[0]]
+        self.assertIsNotNone(models.storage.version(State)[1])
+        Amenity(name="Wifi").save()
+        self.assertEqual(models.storage.version(State)[0], tags[-1])
+        state.name = "Utah"
+        state.save()
+        tags.append(models.storage.version(State)[0])
+        models.storage.delete(state)
+        tags.append(models.storage.version(State)[0])
+        self.assertEqual(len(set(tags)), 4)
+        self.assertEqual(models.storage.version(State)[0], tags[-1])
+        self.assertEqual(models.storage.versions([State, "Amenity"]), {
+            "State": models.storage.version(State),
+            "Amenity": models.storage.version(Amenity)})
+
+    @unittest.skipIf(models.storage_t == "db", "not testing file storage")
+    def test_watch(self):
+        """test watch() reports the class of every object added, changed
+        or deleted"""
+        changes = []
+        models.storage.watch(changes.append)
+        self.addCleanup(FileStorage._FileStorage__watchers.remove,
+                        changes.append)
+        state = State(name="Texas")
+        models.storage.new(state)
+        self.assertEqual(changes, ["State"])
+        state.name = "Utah"
+        models.storage.bulk_new([Amenity(name="Wifi")])
+        models.storage.delete(state)
+        self.assertEqual(changes, ["State", "State", "Amenity", "State"])
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestFileStoragePersistence(unittest.TestCase):
+    """Test how FileStorage writes objects to disk and reads them back"""
+
+    tables = ["objects", "by_class", "by_fk", "by_amenity", "ordered",
+              "unsorted", "ordered_dicts", "unloaded", "dirty", "cache"]
+    state = ["file_path", "format", "lazy", "journal", "journal_max",
+             "group_window", "double_buffer", "stamp"] + tables
+
+    def setUp(self):
+        """Give FileStorage an empty store backed by a scratch file"""
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        for name in self.tables:
+            empty = type(self.saved[name])()
+            setattr(FileStorage, "_FileStorage__" + name, empty)
+        FileStorage._FileStorage__file_path = "test_journal.json"
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__stamp = {"snapshot": None, "journal": None}
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the shared FileStorage state and remove scratch files"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        for path in glob.glob("test_journal.json*"):
+            os.remove(path)
+
+    def reopen(self):
+        """Drop every object in memory and reload them from disk"""
+        for name in self.tables:
+            empty = type(self.saved[name])()
+            setattr(FileStorage, "_FileStorage__" + name, empty)
+        self.storage.reload()
+
+    def test_save_appends_changes(self):
+        """test save() appends only the objects changed since last save"""
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.new(State(name="Ohio"))
+        self.storage.save()
+        state.name = "Utah"
+        self.storage.save()
+        with open("test_journal.json.journal", "r") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[-1]["obj"]["name"], "Utah")
+        self.assertFalse(os.path.exists("test_journal.json"))
+
+    def test_reload_replays_journal(self):
+        """test reload() replays snapshot then journal"""
+        kept = State(name="Texas")
+        gone = State(name="Ohio")
+        self.storage.new(kept)
+        self.storage.new(gone)
+        FileStorage._FileStorage__journal = False
+        self.storage.save()
+        FileStorage._FileStorage__journal = True
+        kept.name = "Utah"
+        self.storage.delete(gone)
+        self.storage.save()
+        with open("test_journal.json.journal", "a") as f:
+            f.write('{"key": "State.torn", "ob')
+        self.reopen()
+        self.assertEqual(list(self.storage.all(State)), ["State." + kept.id])
+        self.assertEqual(self.storage.get(State, kept.id).name, "Utah")
+
+    def test_journal_compaction(self):
+        """test the journal is folded into the snapshot past its limit"""
+        FileStorage._FileStorage__journal_max = 0
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists("test_journal.json.journal"))
+        self.reopen()
+        self.assertEqual(self.storage.get(State, state.id).name, "Texas")
+
+    def test_save_reuses_clean_objects(self):
+        """test save() only serialises objects changed since last save"""
+        FileStorage._FileStorage__journal = False
+        states = [State(name="state_{}".format(i)) for i in range(5)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        self.assertEqual(self.storage.metrics()["last_serialised"], 5)
+        states[0].name = "Utah"
+        self.storage.save()
+        self.assertEqual(self.storage.metrics()["last_serialised"], 1)
+        self.storage.save()
+        self.assertEqual(self.storage.metrics()["last_serialised"], 0)
+        self.reopen()
+        self.assertEqual(self.storage.get(State, states[0].id).name, "Utah")
+        self.assertEqual(self.storage.count(State), 5)
+
+    def test_group_commit(self):
+        """test concurrent saves inside the window share one flush"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__group_window = 0.05
+        states = [State(name="state_{}".format(i)) for i in range(8)]
+        flushes = self.storage.metrics()["saves"]
+
+        def create(state):
+            """Store one state and wait for it to be saved"""
+            self.storage.new(state)
+            self.storage.save()
+
+        threads = [threading.Thread(target=create, args=(state,))
+                   for state in states]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(self.storage.metrics()["saves"] - flushes, 8)
+        self.reopen()
+        self.assertEqual(self.storage.count(State), 8)
+
+    def test_failed_save_keeps_snapshot(self):
+        """test a save that fails midway leaves the old file in place"""
+        FileStorage._FileStorage__journal = False
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Utah"
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.assertEqual(glob.glob("test_journal.json*"),
+                         ["test_journal.json"])
+        self.reopen()
+        self.assertEqual(self.storage.get(State, state.id).name, "Texas")
+
+    def test_save_keeps_file_mode(self):
+        """test save() creates the file with the umask's permissions, keeps
+        those it had, and syncs the directory after the rename"""
+        FileStorage._FileStorage__journal = False
+        umask = os.umask(0)
+        os.umask(umask)
+        self.storage.new(State(name="Texas"))
+        self.storage.save()
+        mode = os.stat("test_journal.json").st_mode & 0o777
+        self.assertEqual(mode, 0o666 & ~umask)
+        os.chmod("test_journal.json", 0o640)
+        self.storage.new(State(name="Utah"))
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            self.storage.save()
+        mode = os.stat("test_journal.json").st_mode & 0o777
+        self.assertEqual(mode, 0o640)
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_double_buffer_fallback(self):
+        """test reload() falls back to the previous snapshot if corrupt"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__double_buffer = True
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Utah"
+        self.storage.save()
+        with open("test_journal.json", "w") as f:
+            f.write('{"State.')
+        self.reopen()
+        self.assertEqual(self.storage.get(State, state.id).name, "Texas")
+        os.remove("test_journal.json.prev")
+        self.assertRaises(ValueError, self.reopen)
+
+    def test_columnar_format(self):
+        """test save() writes and reload() reads the columnar format"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__format = "columnar"
+        state = State(name="Texas")
+        place = Place(name="Loft", amenity_ids=["a"])
+        for obj in [state, place]:
+            self.storage.new(obj)
+        self.storage.save()
+        with open("test_journal.json", "r") as f:
+            self.assertIn('"__format__":"columnar"', f.read(30))
+        self.reopen()
+        self.assertEqual(self.storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(self.storage.get(Place, place.id).amenity_ids, ["a"])
+        FileStorage._FileStorage__format = "json"
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(self.storage.get(State, state.id).to_dict(),
+                         state.to_dict())
+
+    def test_lazy_reload(self):
+        """test reload() only builds objects once they are accessed"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__lazy = True
+        state = State(name="Texas")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for obj in [state] + cities:
+            self.storage.new(obj)
+        self.storage.save()
+        self.assertTrue(os.path.exists("test_journal.json.index"))
+        self.reopen()
+        objects = FileStorage._FileStorage__objects
+        self.assertEqual(objects, {})
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(City), 3)
+        self.assertEqual(self.storage.get(State, state.id).name, "Texas")
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(len(self.storage.get(State, state.id).cities), 3)
+        self.assertEqual(len(objects), 4)
+
+    def test_lazy_save_keeps_unbuilt_objects(self):
+        """test save() copies the objects never built to the new file"""
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__lazy = True
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        self.reopen()
+        self.storage.get(State, states[0].id).name = "Utah"
+        self.storage.delete(self.storage.get(State, states[1].id))
+        self.storage.save()
+        self.assertEqual(self.storage.get(State, states[2].id).name, "2")
+        os.remove("test_journal.json.index")
+        self.reopen()
+        self.assertEqual(len(FileStorage._FileStorage__objects), 0)
+        self.assertEqual(
+            sorted(state.name for state in self.storage.all(State).values()),
+            ["2", "Utah"])
+
+    def test_concurrent_access(self):
+        """test threads can create, update, read and save at once"""
+        FileStorage._FileStorage__journal = False
+        errors = []
+
+        def hammer(n):
+            """Mix writes, reads and saves on the shared store"""
+            try:
+                for i in range(200):
+                    state = State(name="state_{}_{}".format(n, i))
+                    city = City(name="city", state_id=state.id)
+                    self.storage.new(state)
+                    self.storage.new(city)
+                    city.name = "town"
+                    self.storage.all(State)
+                    state.cities
+                    if i % 2:
+                        self.storage.delete(city)
+                    if i % 50 == 0:
+                        self.storage.save()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=hammer, args=(n,))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.storage.count(State), 1600)
+        self.assertEqual(self.storage.count(City), 800)
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(self.storage.count(State), 1600)
+        self.assertEqual(self.storage.count(City), 800)
+
+    def test_concurrent_order_by(self):
+        """test all(order_by=) stays sorted while threads add objects out
+        of order"""
+        FileStorage._FileStorage__journal = False
+        errors = []
+
+        def key(obj):
+            """Return the sort key of all(order_by="name")"""
+            return (obj.name.lower(), obj.id)
+
+        def add(n):
+            """Add states whose names sort before the previous ones"""
+            for i in range(300):
+                self.storage.new(State(name="{:04}_{}".format(300 - i, n)))
+
+        def read():
+            """Check every ordered read is sorted"""
+            try:
+                for _ in range(300):
+                    states = list(self.storage.all(
+                        State, order_by="name").values())
+                    if states != sorted(states, key=key):
+                        errors.append(states)
+                        return
+            except Exception as e:
+                errors.append(e)
+
+        # switch threads often so that reads land between the writes
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+        threads = [threading.Thread(target=add, args=(n,))
+                   for n in range(4)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        states = list(self.storage.all(State, order_by="name").values())
+        self.assertEqual(len(states), 1200)
+        self.assertEqual(states, sorted(states, key=key))
+
+    def test_close_skips_unchanged_file(self):
+        """test close() keeps the objects in memory if nothing changed"""
+        FileStorage._FileStorage__journal = False
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+
+    def test_close_reloads_changed_file(self):
+        """test close() picks up a snapshot written by another process"""
+        FileStorage._FileStorage__journal = False
+        self.storage.save()
+        other = State(name="Ohio")
+        with open("test_journal.json", "w") as f:
+            json.dump({"State." + other.id: other.to_dict()}, f)
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, other.id).name, "Ohio")
+
+    def test_close_applies_new_journal_records(self):
+        """test close() only replays records appended by another process"""
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        other = State(name="Ohio")
+        with open("test_journal.json.journal", "a") as f:
+            f.write(json.dumps({"key": "State." + other.id,
+                                "obj": other.to_dict()}) + "\n")
+        self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(self.storage.get(State, other.id).name, "Ohio")
+
+    def test_unhashable_foreign_key(self):
+        """test a foreign key that is not a string, as a client may send,
+        is stored and saved but not indexed"""
+        user = User(email="a@b.c", password="pwd", city_id=["x"])
+        self.storage.new(user)
+        key = "User." + user.id
+        self.assertIs(self.storage.get(User, user.id), user)
+        self.assertEqual(self.storage.lookup(User, "city_id", "x"), {})
+        user.city_id = "x"
+        self.assertEqual(self.storage.lookup(User, "city_id", "x"),
+                         {key: user})
+        user.city_id = {"id": "x"}
+        self.assertEqual(self.storage.lookup(User, "city_id", "x"), {})
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(self.storage.get(User, user.id).city_id,
+                         {"id": "x"})
+
+    def test_amenity_index(self):
+        """test search_places() follows amenity links as they change"""
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        place = Place(name="Loft", amenity_ids=[wifi.id])
+        for obj in [wifi, pool, place]:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]),
+                         [place])
+        self.assertEqual(place.amenities, [wifi])
+        place.amenity_ids = place.amenity_ids + [pool.id]
+        self.assertEqual(
+            self.storage.search_places(amenities=[wifi.id, pool.id]), [place])
+        place.amenity_ids = [pool.id]
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]), [])
+        self.storage.delete(place)
+        self.assertEqual(self.storage.search_places(amenities=[pool.id]), [])
+
+    def test_bad_amenity_ids(self):
+        """test amenity_ids that are not a list of strings, as a client
+        may send, are not indexed and can be replaced"""
+        wifi = Amenity(name="Wifi")
+        place = Place(name="Loft", amenity_ids=5)
+        for obj in [wifi, place]:
+            self.storage.new(obj)
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]), [])
+        place.amenity_ids = [wifi.id, ["x"]]
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]),
+                         [place])
+        place.amenity_ids = 5
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]), [])
+        place.amenity_ids = [wifi.id]
+        self.assertEqual(self.storage.search_places(amenities=[wifi.id]),
+                         [place])
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Contains the TestTimedQueuePool classes
+"""
+
+from models.engine import pool
+import os
+import pep8
+from sqlalchemy import create_engine, exc
+import tempfile
+import unittest
+
+TimedQueuePool = pool.TimedQueuePool
+
+
+class TestTimedQueuePoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of TimedQueuePool"""
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["models/engine/pool.py",
+                                    "tests/test_models/test_engine/"
+                                    "test_pool.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_pool_docstrings(self):
+        """Test for the pool.py module and TimedQueuePool docstrings"""
+        self.assertTrue(len(pool.__doc__) >= 1)
+        self.assertTrue(len(TimedQueuePool.__doc__) >= 1)
+        self.assertTrue(len(TimedQueuePool.stats.__doc__) >= 1)
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """Test the TimedQueuePool class"""
+
+    def setUp(self):
+        """Create an engine with a single connection on a scratch file"""
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "pool.db")
+        self.engine = create_engine("sqlite:///" + self.path,
+                                    poolclass=TimedQueuePool, pool_size=1,
+                                    max_overflow=0, pool_timeout=0.05)
+
+    def tearDown(self):
+        """Close the engine and remove the scratch file"""
+        self.engine.dispose()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.folder)
+
+    def test_stats(self):
+        """test stats() counts checkouts, timeouts and occupancy"""
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["checkouts"], 0)
+        self.assertEqual(stats["wait_avg"], 0)
+        connection = self.engine.connect()
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["checked_out"], 1)
+        self.assertEqual(stats["size"], 1)
+        self.assertRaises(exc.TimeoutError, self.engine.connect)
+        connection.close()
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertGreaterEqual(stats["wait_max"], 0.05)
@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryDocs and TestQuery classes, run against the storage
+engine HBNB_TYPE_STORAGE selects so that both give the same results
+"""
+
+import models
+from models.base_model import BaseModel
+from models.city import City
+from models.engine import query
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import time
+import unittest
+
+Query = query.Query
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Query class"""
+
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["models/engine/query.py",
+                                    "tests/test_models/test_engine/"
+                                    "test_query.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_query_docstrings(self):
+        """Test for the query.py module, Query and its methods docstrings"""
+        self.assertTrue(len(query.__doc__) >= 1)
+        self.assertTrue(len(query.compare.__doc__) >= 1)
+        self.assertTrue(len(Query.__doc__) >= 1)
+        for name in ["filter", "order_by", "limit", "matches", "all",
+                     "first", "count"]:
+            self.assertTrue(len(getattr(Query, name).__doc__) >= 1)
+
+
+class TestQuery(unittest.TestCase):
+    """Test storage.query() gives the same results on every engine"""
+
+    def setUp(self):
+        """Store two states, three cities and places in them"""
+        self.user = User(email="a@b.c", password="pwd")
+        self.user.save()
+        self.states = [State(name=name) for name in ["north", "south"]]
+        for state in self.states:
+            state.save()
+        self.cities = [City(name=name, state_id=self.states[i].id)
+                       for i, name in [(0, "b"), (0, "a"), (1, "c")]]
+        for city in self.cities:
+            city.save()
+        self.places = []
+        for i, (name, price, description) in enumerate([
+                ("loft", 100, "x"), ("barn", 40, None), ("attic", 40, "y"),
+                ("cabin", 250, None), ("dome", 70, "x")]):
+            place = Place(name=name, price_by_night=price,
+                          description=description, user_id=self.user.id,
+                          city_id=self.cities[i % 3].id)
+            place.save()
+            self.places.append(place)
+        self.city_ids = [city.id for city in self.cities]
+
+    def tearDown(self):
+        """Remove the stored objects"""
+        for obj in self.places + self.cities + self.states + [self.user]:
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def places_query(self):
+        """Return a Query on the places of setUp"""
+        return models.storage.query(Place).filter(city_id__in=self.city_ids)
+
+    def names(self, objs):
+        """Return the names of objs, in order"""
+        return [obj.name for obj in objs]
+
+    def test_filter_equal(self):
+        """test filter() keeps the objects whose attribute is equal"""
+        found = models.storage.query(City).filter(
+            state_id=self.states[0].id).all()
+        self.assertEqual(sorted(self.names(found)), ["a", "b"])
+        found = models.storage.query("City").filter(
+            state_id=self.states[0].id, name="a").all()
+        self.assertEqual(found, [self.cities[1]])
+        self.assertEqual(models.storage.query(City).filter(
+            state_id="nope").all(), [])
+
+    def test_filter_operators(self):
+        """test filter() with the ne, lt, lte, gt, gte and in operators"""
+        cases = [
+            ({"price_by_night__lt": 70}, ["attic", "barn"]),
+            ({"price_by_night__lte": 70}, ["attic", "barn", "dome"]),
+            ({"price_by_night__gt": 70}, ["cabin", "loft"]),
+            ({"price_by_night__gte": 250}, ["cabin"]),
+            ({"price_by_night__ne": 40}, ["cabin", "dome", "loft"]),
+            ({"price_by_night__in": [40, 250]}, ["attic", "barn", "cabin"]),
+            ({"name__in": ("dome", "nope")}, ["dome"]),
+            ({"price_by_night__lte": 100, "price_by_night__gt": 40,
+              "city_id": self.city_ids[0]}, ["loft"]),
+        ]
+        for conditions, names in cases:
+            with self.subTest(conditions=conditions):
+                found = self.places_query().filter(**conditions).all()
+                self.assertEqual(sorted(self.names(found)), names)
+
+    def test_filter_none(self):
+        """test missing values only equal None, as in SQL"""
+        found = self.places_query().filter(description=None).all()
+        self.assertEqual(sorted(self.names(found)), ["barn", "cabin"])
+        found = self.places_query().filter(description__ne="x").all()
+        self.assertEqual(self.names(found), ["attic"])
+        found = self.places_query().filter(description__ne=None).all()
+        self.assertEqual(sorted(self.names(found)), ["attic", "dome", "loft"])
+
+    def test_filter_none_foreign_key(self):
+        """test filter() on a foreign key with None finds the objects
+        without one, as IS NULL does"""
+        if models.storage_t != "db":
+            # the column is NOT NULL, only a file can hold such a city
+            orphan = City(name="d")
+            orphan.state_id = None
+            orphan.save()
+            self.cities.append(orphan)
+        expected = sorted(city.id for city in models.storage.all(
+            City).values() if getattr(city, "state_id", None) is None)
+        found = models.storage.query(City).filter(state_id=None).all()
+        self.assertEqual(sorted(city.id for city in found), expected)
+        found = models.storage.query(City).filter(
+            state_id__in=[None, self.states[1].id]).all()
+        self.assertEqual(self.names(found), ["c"])
+
+    def test_unknown_attribute(self):
+        """test an attribute no object has is None: it only equals None
+        and does not change the order"""
+        self.assertEqual(self.places_query().filter(nope="x").all(), [])
+        self.assertEqual(self.places_query().filter(nope__gt=1).count(), 0)
+        self.assertEqual(self.places_query().filter(nope=None).count(), 5)
+        found = self.places_query().order_by("nope").all()
+        self.assertEqual(found, sorted(self.places, key=lambda place:
+                                       place.id))
+
+    def test_order_by_mixed_types(self):
+        """test order_by() sorts values of different types, numbers
+        before strings, as a text column holds them"""
+        cabin = self.places[3]
+        cabin.description = 5
+        cabin.save()
+        found = self.places_query().order_by("description", "name").all()
+        self.assertEqual(self.names(found),
+                         ["barn", "cabin", "dome", "loft", "attic"])
+
+    def test_filter_id(self):
+        """test filter() on id finds the objects with these ids"""
+        found = models.storage.query(Place).filter(
+            id=self.places[2].id).all()
+        self.assertEqual(found, [self.places[2]])
+        ids = [self.places[0].id, "nope", self.places[3].id]
+        found = models.storage.query(Place).filter(id__in=ids).all()
+        self.assertEqual(sorted(self.names(found)), ["cabin", "loft"])
+
+    def test_order_by(self):
+        """test order_by() sorts by each attribute, ties broken by id"""
+        found = self.places_query().order_by("name").all()
+        self.assertEqual(self.names(found),
+                         ["attic", "barn", "cabin", "dome", "loft"])
+        found = self.places_query().order_by("-name").all()
+        self.assertEqual(self.names(found),
+                         ["loft", "dome", "cabin", "barn", "attic"])
+        found = self.places_query().order_by("-price_by_night",
+                                             "name").all()
+        self.assertEqual(self.names(found),
+                         ["cabin", "loft", "dome", "attic", "barn"])
+        barn, attic = self.places[1], self.places[2]
+        found = self.places_query().filter(price_by_night=40).order_by(
+            "price_by_night").all()
+        self.assertEqual(found, sorted([barn, attic], key=lambda place:
+                                       place.id))
+
+    def test_order_by_index(self):
+        """test order_by() on a whole class sorts all of its objects"""
+        found = models.storage.query(State).order_by("created_at").all()
+        self.assertEqual(found, sorted(
+            models.storage.all(State).values(),
+            key=lambda state: (state.created_at, state.id)))
+        found = models.storage.query(State).order_by("created_at").limit(
+            1).all()
+        self.assertEqual(found, [min(
+            models.storage.all(State).values(),
+            key=lambda state: (state.created_at, state.id))])
+
+    def test_limit_first_count(self):
+        """test limit(), first() and count()"""
+        query = self.places_query().order_by("name")
+        self.assertEqual(self.names(query.limit(2).all()), ["attic", "barn"])
+        self.assertEqual(query.limit(0).all(), [])
+        self.assertEqual(query.first().name, "attic")
+        self.assertIsNone(query.filter(name="nope").first())
+        self.assertEqual(query.count(), 5)
+        self.assertEqual(query.limit(2).count(), 5)
+        self.assertEqual(query.filter(price_by_night=40).count(), 2)
+        self.assertEqual(self.names(query), self.names(query.all()))
+
+    def test_builder(self):
+        """test each call returns a new Query and leaves the first one"""
+        query = self.places_query()
+        narrow = query.filter(price_by_night=40)
+        self.assertIsInstance(narrow, Query)
+        self.assertIsNot(narrow, query)
+        self.assertEqual(query.count(), 5)
+        self.assertEqual(narrow.count(), 2)
+        self.assertRaises(ValueError, query.filter, name__like="a%")
+
+    @unittest.skipIf(models.storage_t != "db", "not testing db storage")
+    def test_unmapped_class(self):
+        """test a query on a class without a table finds nothing"""
+        for cls in [BaseModel, "BaseModel", "Nope"]:
+            with self.subTest(cls=cls):
+                query = models.storage.query(cls).filter(id="x")
+                self.assertEqual(query.all(), [])
+                self.assertIsNone(query.first())
+                self.assertEqual(query.count(), 0)
+
+    def test_relationships(self):
+        """test the relationships list the same objects as a query"""
+        state = models.storage.get(State, self.states[0].id)
+        self.assertEqual(sorted(self.names(state.cities)), ["a", "b"])
+        city = models.storage.get(City, self.cities[0].id)
+        self.assertEqual(sorted(self.names(city.places)), ["cabin", "loft"])
+
+    def test_query_faster_than_scan(self):
+        """test a query on a foreign key is faster than filtering all()"""
+        state, other = State(name="big"), State(name="other")
+        models.storage.bulk_save([state, other])
+        cities = [City(name=str(i), state_id=state.id if i % 50 == 0
+                       else other.id) for i in range(5000)]
+        models.storage.bulk_save(cities)
+
+        def remove():
+            """Remove the states and cities of this test"""
+            for city in models.storage.query(City).filter(
+                    state_id__in=[state.id, other.id]):
+                models.storage.delete(city)
+            for obj in [state, other]:
+                models.storage.delete(models.storage.get(State, obj.id))
+            models.storage.save()
+
+        self.addCleanup(remove)
+
+        def best(action):
+            """Return the best time of 3 runs of action"""
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                found = action()
+                times.append(time.perf_counter() - start)
+                self.assertEqual(len(found), 100)
+            return min(times)
+
+        scan = best(lambda: [city for city in
+                             models.storage.all(City).values()
+                             if city.state_id == state.id])
+        query = best(lambda: models.storage.query(City).filter(
+            state_id=state.id).all())
+        self.assertLess(query, scan)
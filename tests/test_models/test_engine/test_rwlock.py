@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Contains the TestRWLock classes
+"""
+
+from models.engine import rwlock
+import pep8
+import threading
+import time
+import unittest
+
+RWLock = rwlock.RWLock
+
+
+class TestRWLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of RWLock class"""
+
+    def test_pep8_conformance_rwlock(self):
+        """Test that models/engine/rwlock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["models/engine/rwlock.py",
+                                    "tests/test_models/test_engine/"
+                                    "test_rwlock.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_rwlock_docstrings(self):
+        """Test for the rwlock.py module and RWLock class docstrings"""
+        self.assertTrue(len(rwlock.__doc__) >= 1)
+        self.assertTrue(len(RWLock.__doc__) >= 1)
+
+
+class TestRWLock(unittest.TestCase):
+    """Test the RWLock class"""
+
+    def test_readers_share(self):
+        """test several threads can hold the read lock together"""
+        lock = RWLock()
+        inside = []
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            """Hold the read lock until every reader is inside"""
+            with lock.read():
+                inside.append(1)
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(inside), 3)
+
+    def test_writer_excludes_readers(self):
+        """test a reader waits for the writer to finish"""
+        lock = RWLock()
+        events = []
+
+        def reader():
+            """Record when the read lock was acquired"""
+            with lock.read():
+                events.append("read")
+
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            time.sleep(0.05)
+            events.append("write done")
+        thread.join()
+        self.assertEqual(events, ["write done", "read"])
+
+    def test_reentrant(self):
+        """test a writer may nest writes and reads"""
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                self.assertRaises(RuntimeError, lock.write().__enter__)
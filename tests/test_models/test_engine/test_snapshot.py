@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the tests of the columnar snapshot format
+"""
+
+from datetime import datetime
+import json
+import models
+from models.engine import snapshot
+from models.engine.file_storage import classes
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of snapshot module"""
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["models/engine/snapshot.py",
+                                    "convert_snapshot.py",
+                                    "tests/test_models/test_engine/"
+                                    "test_snapshot.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+    def test_snapshot_docstrings(self):
+        """Test for the snapshot.py module and function docstrings"""
+        self.assertTrue(len(snapshot.__doc__) >= 1)
+        for func in [snapshot.micros, snapshot.is_columnar, snapshot.encode,
+                     snapshot.encode_records, snapshot.decode,
+                     snapshot.decode_records, snapshot.convert]:
+            self.assertTrue(len(func.__doc__) >= 1)
+
+
+@unittest.skipIf(models.storage_t == "db", "not testing file storage")
+class TestSnapshot(unittest.TestCase):
+    """Test the columnar snapshot format"""
+
+    def setUp(self):
+        """Build objects of several classes and attribute sets"""
+        self.objs = [
+            State(name="Texas"),
+            State(name="Ohio", capital="Columbus"),
+            Place(name="Loft", amenity_ids=["a", "b"], price_by_night=90),
+            User(email="a@b.c", password="pwd"),
+        ]
+        self.objs[0].created_at = datetime(2017, 9, 28, 21, 3, 54)
+
+    def test_round_trip(self):
+        """test decode() rebuilds the objects encode() wrote"""
+        doc = json.loads(snapshot.encode(self.objs))
+        self.assertTrue(snapshot.is_columnar(doc))
+        self.assertEqual(len(doc["classes"]["State"]), 2)
+        objs = dict(snapshot.decode(doc, classes))
+        self.assertEqual(len(objs), len(self.objs))
+        for obj in self.objs:
+            key = obj.__class__.__name__ + "." + obj.id
+            self.assertIs(type(objs[key]), type(obj))
+            self.assertEqual(objs[key].to_dict(), obj.to_dict())
+            self.assertIs(type(objs[key].created_at), datetime)
+        self.assertNotIn("password", objs["User." + self.objs[3].id].__dict__)
+
+    def test_micros(self):
+        """test micros() counts microseconds since the epoch"""
+        self.assertEqual(snapshot.micros(datetime(1970, 1, 1)), 0)
+        self.assertEqual(snapshot.micros(datetime(1970, 1, 2, 0, 0, 0, 5)),
+                         86400000005)
+
+    def test_convert(self):
+        """test convert() turns JSON into columnar and back"""
+        folder = tempfile.mkdtemp()
+        paths = [os.path.join(folder, name) for name in ["a", "b", "c"]]
+        with open(paths[0], "w") as f:
+            json.dump({obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+                       for obj in self.objs}, f)
+        snapshot.convert("columnar", paths[0], paths[1])
+        snapshot.convert("json", paths[1], paths[2])
+        with open(paths[1], "r") as f:
+            self.assertTrue(snapshot.is_columnar(json.load(f)))
+        docs = []
+        for path in [paths[0], paths[2]]:
+            with open(path, "r") as f:
+                docs.append(json.load(f))
+            os.remove(path)
+        os.remove(paths[1])
+        os.rmdir(folder)
+        self.assertEqual(docs[0], docs[1])
+
+    def test_script(self):
+        """test convert_snapshot.py converts without loading the models
+        package, so neither warns nor reads the file.json of its working
+        directory"""
+        script = os.path.abspath("convert_snapshot.py")
+        folder = tempfile.mkdtemp()
+        paths = [os.path.join(folder, name)
+                 for name in ["file.json", "a", "b"]]
+        with open(paths[0], "w") as f:
+            f.write("not json")
+        with open(paths[1], "w") as f:
+            json.dump({obj.__class__.__name__ + "." + obj.id: obj.to_dict()
+                       for obj in self.objs}, f)
+        result = subprocess.run(
+            [sys.executable, script, "columnar", "a", "b"], cwd=folder,
+            capture_output=True, text=True)
+        with open(paths[2], "r") as f:
+            doc = json.load(f)
+        for path in paths:
+            os.remove(path)
+        os.rmdir(folder)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stderr, "")
+        objs = dict(snapshot.decode(doc, classes))
+        for obj in self.objs:
+            key = obj.__class__.__name__ + "." + obj.id
+            self.assertEqual(objs[key].to_dict(), obj.to_dict())
+
+    def test_script_usage(self):
+        """test convert_snapshot.py prints its usage on bad arguments"""
+        result = subprocess.run([sys.executable, "convert_snapshot.py",
+                                 "yaml", "a", "b"],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("usage:", result.stderr)
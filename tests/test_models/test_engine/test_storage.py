@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Contains the TestStorageDocs and TestStorage classes, run against the
+storage engine HBNB_TYPE_STORAGE selects so that both behave the same
+"""
+
+from datetime import datetime
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestStorageDocs(unittest.TestCase):
+    """Tests to check the style of the shared storage tests"""
+
+    def test_pep8_conformance_test_storage(self):
+        """Test that tests/test_models/test_engine/test_storage.py conforms
+        to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(["tests/test_models/test_engine/"
+                                    "test_storage.py"])
+        self.assertEqual(
+            result.total_errors, 0, "Found code style errors (and warnings)."
+        )
+
+
+class TestStorage(unittest.TestCase):
+    """Test the methods every storage engine has give the same results"""
+
+    def test_search_places(self):
+        """test search_places() filters by state or city and amenities"""
+        user = User(email="a@b.c", password="pwd")
+        state = State(name="Texas")
+        austin = City(name="Austin", state_id=state.id)
+        dallas = City(name="Dallas", state_id=state.id)
+        other = State(name="Ohio")
+        akron = City(name="Akron", state_id=other.id)
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        places = [Place(name=str(i), city_id=city.id, user_id=user.id)
+                  for i, city in enumerate([austin, dallas, akron])]
+        objs = [user, state, austin, dallas, other, akron, wifi, pool]
+        for obj in objs + places:
+            obj.save()
+        if models.storage_t == "db":
+            places[0].amenities = [wifi, pool]
+            places[2].amenities = [wifi]
+        else:
+            places[0].amenity_ids = [wifi.id, pool.id]
+            places[2].amenity_ids = [wifi.id]
+        models.storage.save()
+
+        def search(**filters):
+            """Return the names of the places found"""
+            found = models.storage.search_places(**filters)
+            return sorted(place.name for place in found)
+
+        self.assertEqual(search(states=[state.id]), ["0", "1"])
+        self.assertEqual(search(states=[state.id], cities=[akron.id]),
+                         ["0", "1", "2"])
+        self.assertEqual(search(cities=[austin.id, "nope"]), ["0"])
+        self.assertEqual(search(states=[state.id], amenities=[wifi.id]),
+                         ["0"])
+        self.assertIn("2", search(amenities=[wifi.id]))
+        self.assertNotIn("2", search(amenities=[wifi.id, pool.id]))
+        self.assertEqual(search(states=["nope"]), [])
+
+    def test_page(self):
+        """test page() walks objects in (created_at, id) keyset order"""
+        state = State(name="Texas")
+        state.save()
+        stamp = datetime(2017, 1, 1)
+        cities = [City(name=str(i), state_id=state.id) for i in range(5)]
+        for i, city in enumerate(cities):
+            # ties on created_at are broken by id
+            city.created_at = stamp if i % 2 else stamp.replace(year=2016)
+            city.save()
+        cities.sort(key=lambda city: (city.created_at, city.id))
+
+        def walk(cls, limit, **filters):
+            """Return every object paged through limit at a time"""
+            found, after = [], None
+            while True:
+                page = models.storage.page(cls, limit, after, **filters)
+                self.assertLessEqual(len(page), limit)
+                found += page
+                if len(page) < limit:
+                    return found
+                after = (page[-1].created_at, page[-1].id)
+
+        self.assertEqual(walk(City, 2, state_id=state.id), cities)
+        self.assertEqual(walk("City", 5, state_id=state.id), cities)
+        self.assertEqual(walk(City, 2, state_id="nope"), [])
+        found = walk(City, 3)
+        self.assertEqual(len(found), models.storage.count(City))
+        self.assertEqual(found, sorted(found, key=lambda city:
+                                       (city.created_at, city.id)))
+        places = models.storage.search_places(limit=1)
+        self.assertLessEqual(len(places), 1)
+
+    def test_iterate(self):
+        """test iterate() yields the objects matching the filters"""
+        state = State(name="Texas")
+        state.save()
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for city in cities:
+            city.save()
+        found = models.storage.iterate(City, state_id=state.id)
+        self.assertIs(iter(found), found)
+        self.assertEqual(sorted(city.id for city in found),
+                         sorted(city.id for city in cities))
+        self.assertEqual(list(models.storage.iterate("City", name="nope")),
+                         [])
+        self.assertEqual(len(list(models.storage.iterate(State))),
+                         models.storage.count(State))
+
+    def test_bulk_save(self):
+        """test bulk_save() stores every object with a single save"""
+        state = State(name="Texas")
+        state.save()
+        cities = [City(name=str(i), state_id=state.id) for i in range(50)]
+        before = models.storage.count(City)
+        models.storage.bulk_save(cities)
+        models.storage.close()
+        self.assertEqual(models.storage.count(City), before + 50)
+        found = models.storage.get(City, cities[7].id)
+        self.assertEqual(found.name, "7")
+        self.assertEqual(found.state_id, state.id)
+        self.assertEqual(found.created_at, cities[7].created_at)
+        models.storage.bulk_save([])
@@ -6,16 +6,21 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.page_cache import cached
 app = Flask(__name__)
 
 
 @app.route('/hbnb_filters', strict_slashes=False)
+@cached("State", "City", "Amenity")
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
-    amenities = storage.all("Amenity").values()
+    states = storage.all("State", order_by="name").values()
+    cities = {}
+    for city in storage.all("City", order_by="name").values():
+        cities.setdefault(city.state_id, []).append(city)
+    amenities = storage.all("Amenity", order_by="name").values()
     return render_template('10-hbnb_filters.html', states=states,
-                           amenities=amenities)
+                           cities=cities, amenities=amenities)
 
 
 @app.teardown_appcontext
@@ -6,17 +6,23 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.page_cache import cached
 app = Flask(__name__)
 
 
 @app.route('/states', strict_slashes=False)
 @app.route('/states/<state_id>', strict_slashes=False)
+@cached("State", "City")
 def states(state_id=None):
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State")
+    states = storage.all("State", order_by="name")
+    cities = []
     if state_id is not None:
+        cities = storage.query("City").filter(state_id=state_id).order_by(
+            "name").all()
         state_id = 'State.' + state_id
-    return render_template('9-states.html', states=states, state_id=state_id)
+    return render_template('9-states.html', states=states, state_id=state_id,
+                           cities=cities)
 
 
 @app.teardown_appcontext
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""
+caches the HTML of pages rendered from stored objects
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from models import storage
+import threading
+
+
+def cached(*classes, maxsize=256):
+    """
+    caches the HTML a view returns for each set of URL arguments, up to
+    maxsize pages, for as long as storage.version() of every class in
+    classes is unchanged, so changes made by another process also show
+    """
+    def decorator(view):
+        """returns view serving its pages from the cache"""
+        pages = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(view)
+        def cached_view(**kwargs):
+            """renders the page only if an object of classes changed"""
+            tags = [tag for tag, modified in
+                    storage.versions(classes).values()]
+            key = tuple(sorted(kwargs.items()))
+            with lock:
+                page = pages.get(key)
+                if page is not None and page[0] == tags:
+                    pages.move_to_end(key)
+                    return page[1]
+            html = view(**kwargs)
+            if [tag for tag, modified in
+                    storage.versions(classes).values()] == tags:
+                # no object changed while the page was rendered
+                with lock:
+                    pages[key] = (tags, html)
+                    pages.move_to_end(key)
+                    if len(pages) > maxsize:
+                        pages.popitem(last=False)
+            return html
+        return cached_view
+    return decorator